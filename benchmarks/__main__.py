@@ -0,0 +1,58 @@
+"""Run benchmarks and emit the results as JSON lines."""
+
+import argparse
+import contextlib
+import datetime
+import json
+import logging
+import sys
+
+import log
+
+from mine import __version__
+
+from . import cycle, memory, processes, serialization, stop
+
+SUITES = {
+    "cycle": cycle,
+    "memory": memory,
+    "processes": processes,
+    "serialization": serialization,
+    "stop": stop,
+}
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument(
+        "suites", nargs="*", metavar="suite", help=f"one of: {', '.join(SUITES)}"
+    )
+    parser.add_argument("-o", "--output", help="append results to a file")
+    parser.add_argument(
+        "-q", "--quick", action="store_true", help="only run the smallest sizes"
+    )
+    args = parser.parse_args(args)
+    for name in args.suites:
+        if name not in SUITES:
+            parser.error(f"unknown suite: {name!r}")
+
+    log.init(level=logging.WARNING)
+    log.silence("datafiles")
+
+    if args.output:
+        output = open(args.output, "a", encoding="utf-8")
+    else:
+        output = contextlib.nullcontext(sys.stdout)
+
+    timestamp = datetime.datetime.now(datetime.timezone.utc).isoformat()
+    with output as file:
+        for name in args.suites or SUITES:
+            suite = SUITES[name]
+            kwargs = {"sizes": suite.SIZES[:2]} if args.quick else {}
+            for result in suite.run(**kwargs):
+                result = {"version": __version__, "time": timestamp, **result}
+                print(json.dumps(result), file=file, flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Timings for each phase of the daemon cycle."""
+
+import os
+import shutil
+import tempfile
+from collections.abc import Iterator
+from unittest.mock import patch
+
+import datafiles
+
+from mine import cache, services
+from mine.models import Data
+
+from .fakes import FakeManager, create_data, create_tree
+from .timing import measure, quiet
+
+SIZES = [(10, 2), (100, 10), (1_000, 25), (10_000, 100)]
+PROCESSES = 600
+FILES = 10_000
+
+
+def run(sizes=None, processes=None, files=None) -> Iterator[dict]:
+    """Time each phase of the daemon cycle for synthetic settings."""
+    processes = processes or PROCESSES
+    files = files or FILES
+    for applications, computers in sizes or SIZES:
+        parameters = {
+            "applications": applications,
+            "computers": computers,
+            "processes": processes,
+            "files": files,
+        }
+        for name, seconds in _run(applications, computers, processes, files):
+            yield {"suite": "cycle", "name": name, **parameters, **seconds}
+
+
+def _run(applications: int, computers: int, processes: int, files: int):
+    with tempfile.TemporaryDirectory() as root, patch.object(
+        cache, "DIRECTORY", os.path.join(root, ".cache")
+    ):
+        path = os.path.join(root, services.CONFIG)
+        data = create_data(path, applications, computers)
+        computer = data.config.computers[0]
+        running = data.config.applications[::2]
+        manager = FakeManager(processes, running)
+
+        yield "load", measure(lambda: Data(path))
+        yield "save", measure(data.save)
+
+        with datafiles.frozen(data):
+            with quiet():
+                data.update_status(computer, manager)
+
+            def update_status():
+                manager.invalidate()
+                data.update_status(computer, manager)
+
+            yield "update_status", measure(update_status)
+
+            def queue():
+                manager.invalidate()
+                data.queue_all_applications(computer)
+
+            def launch_queued_applications():
+                data.launch_queued_applications(computer, manager)
+
+            yield "launch_queued_applications", measure(
+                launch_queued_applications, setup=queue
+            )
+
+            yield "prune_status", measure(data.prune_status)
+
+        create_tree(root, files)
+
+        def clear_cache():
+            shutil.rmtree(cache.DIRECTORY, ignore_errors=True)
+
+        yield "delete_conflicts_cold", measure(
+            lambda: services.delete_conflicts(root), setup=clear_cache
+        )
+        yield "delete_conflicts_warm", measure(
+            lambda: services.delete_conflicts(root),
+            setup=lambda: services.delete_conflicts(root),
+        )
+        yield "delete_conflicts_config", measure(
+            lambda: services.delete_conflicts(root, config_only=True, path=path)
+        )
@@ -0,0 +1,162 @@
+"""Synthetic settings, process tables, and sharing directories."""
+
+import contextlib
+import itertools
+import os
+from collections.abc import Sequence
+from unittest.mock import patch
+
+import datafiles
+import psutil
+
+from mine.manager import LinuxManager, ProcessSnapshot
+from mine.models import (
+    Application,
+    Computer,
+    Data,
+    ProgramConfig,
+    ProgramStatus,
+    State,
+    Status,
+)
+
+CONFLICT = "{} (Jace's conflicted copy 2015-03-11).{}"
+
+
+def create_data(path: str, applications: int, computers: int, states=4) -> Data:
+    """Create a settings file with synthetic applications and status."""
+    config = ProgramConfig(
+        computers=[create_computer(index) for index in range(computers)],
+        applications=[create_application(index) for index in range(applications)],
+    )
+
+    status = ProgramStatus()
+    for index, application in enumerate(config.applications):
+        entry = Status(application.name)
+        for offset in range(min(states, computers)):
+            computer = config.computers[(index + offset) % computers]
+            state = State(computer.name)
+            status.counter += 1
+            state.timestamp.started = status.counter
+            if offset:
+                status.counter += 1
+                state.timestamp.stopped = status.counter
+            entry.computers.append(state)
+        status.applications.append(entry)
+
+    data = Data(path)
+    with datafiles.frozen(data):
+        data.config = config
+        data.status = status
+    return data
+
+
+def create_computer(index: int) -> Computer:
+    address = ":".join(f"{(index >> shift) & 0xFF:02X}" for shift in range(40, -8, -8))
+    return Computer(
+        f"computer-{index}", f"serial-{index}", address, f"computer-{index}.local"
+    )
+
+
+def create_application(index: int) -> Application:
+    application = Application(f"app-{index}")
+    application.versions.linux = f"app{index}"
+    application.versions.mac = f"App{index}.app"
+    application.properties.auto_queue = index % 3 == 0
+    application.properties.single_instance = index % 5 == 0
+    return application
+
+
+def create_tree(root: str, files: int, width=10, depth=3, conflicts=5):
+    """Create a directory tree resembling a shared folder."""
+    directories = [root]
+    for level in range(depth):
+        directories += [
+            os.path.join(parent, f"folder-{level}-{index}")
+            for parent in directories
+            if parent.count(os.sep) - root.count(os.sep) == level
+            for index in range(width)
+        ]
+
+    for index in range(files):
+        dirname = directories[index % len(directories)]
+        os.makedirs(dirname, exist_ok=True)
+        if index < conflicts:
+            filename = CONFLICT.format(f"file-{index}", "txt")
+        else:
+            filename = f"file-{index}.txt"
+        with open(os.path.join(dirname, filename), "w", encoding="utf-8"):
+            pass
+
+
+class FakeProcess:
+    """Stand-in for 'psutil.Process' with a fixed command line."""
+
+    def __init__(self, table: list, pid: int, *cmdline: str, parent=0):
+        self.table = table
+        self.pid = pid
+        self._cmdline = list(cmdline)
+        self._parent = parent
+
+    def __repr__(self):
+        return f"<process {self.pid}: {' '.join(self._cmdline)}>"
+
+    def oneshot(self):
+        return contextlib.nullcontext()
+
+    def name(self):
+        return os.path.basename(self._cmdline[0])
+
+    def status(self):
+        return psutil.STATUS_RUNNING
+
+    def create_time(self):
+        return float(self.pid)
+
+    def ppid(self):
+        return self._parent
+
+    def cmdline(self):
+        return list(self._cmdline)
+
+    def is_running(self):
+        return self in self.table
+
+    def terminate(self):
+        if self in self.table:
+            self.table.remove(self)
+
+    kill = terminate
+
+    def wait(self, timeout=None):  # pylint: disable=unused-argument
+        return 0
+
+
+class FakeManager(LinuxManager):
+    """Linux application manager backed by a synthetic process table."""
+
+    def __init__(self, processes: int, running: Sequence[Application] = ()):
+        self.processes: list[FakeProcess] = []
+        self.scans = 0
+        self._pids = itertools.count(1)
+        for index in range(processes):
+            self._add(f"/usr/lib/service-{index}/bin/worker", "--daemon")
+        for application in running:
+            self._launch(application)
+
+    @property
+    def snapshot(self) -> ProcessSnapshot:
+        if self._snapshot is None:
+            with patch("psutil.process_iter", return_value=list(self.processes)):
+                self._snapshot = ProcessSnapshot()
+            self.scans += 1
+        return self._snapshot
+
+    def _launch(self, application):
+        return self._add(f"/usr/bin/{application.versions.linux}")
+
+    def _add(self, *cmdline, parent=0):
+        pid = next(self._pids)
+        process = FakeProcess(self.processes, pid, *cmdline, parent=parent)
+        self.processes.append(process)
+        return process
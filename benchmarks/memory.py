@@ -0,0 +1,50 @@
+"""Memory used by loaded settings with long status histories."""
+
+import gc
+import os
+import tempfile
+import tracemalloc
+from collections.abc import Iterator
+
+from mine.models import Data
+
+from .fakes import create_data
+from .timing import measure
+
+SIZES = [(100, 10), (1_000, 10), (2_500, 25), (5_000, 25)]
+STATES = 4  # status rows per application
+
+
+def run(sizes=None) -> Iterator[dict]:
+    """Measure the time and memory to load synthetic settings."""
+    for applications, computers in sizes or SIZES:
+        rows = applications * min(STATES, computers)
+        parameters = {"applications": applications, "computers": computers}
+        with tempfile.TemporaryDirectory() as root:
+            path = os.path.join(root, "mine.yml")
+            create_data(path, applications, computers, states=STATES)
+
+            allocated = allocate(lambda: Data(path))
+            yield {
+                "suite": "memory",
+                "name": "load",
+                **parameters,
+                "rows": rows,
+                "bytes": allocated,
+                "bytes_per_row": allocated / rows,
+                **measure(lambda: Data(path)),
+            }
+
+
+def allocate(function) -> int:
+    """Get the memory still allocated by the object a function returns."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = function()
+        gc.collect()
+        allocated, _peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return allocated
@@ -0,0 +1,97 @@
+"""Timings for scanning running processes against a synthetic '/proc'."""
+
+import builtins
+import os
+import sys
+import tempfile
+from collections.abc import Callable, Iterator
+from unittest.mock import patch
+
+import psutil
+
+from mine.manager import ProcessSnapshot
+
+from .timing import measure
+
+SIZES = [100, 600, 3_000]
+
+BOOT_TIME = 1_700_000_000
+STAT = (
+    "{pid} ({name}) S 1 {pid} {pid} 0 -1 4194304 100 0 0 0 0 0 0 0 20 0 1 0 "
+    "{started} 1000000 100 18446744073709551615 0 0 0 0 0 0 0 0 0 0 0 0 17 0 0 0 0 0 0\n"
+)
+
+
+def run(sizes=None) -> Iterator[dict]:
+    """Time process scans with and without cached command lines."""
+    if not sys.platform.startswith("linux"):
+        return
+
+    for processes in sizes or SIZES:
+        with tempfile.TemporaryDirectory() as root, patch.object(
+            psutil, "PROCFS_PATH", root
+        ):
+            create_procfs(root, processes)
+            cache: dict = {}
+            ProcessSnapshot(cache)
+
+            for name, function in {
+                "scan_without_oneshot": scan_without_oneshot,
+                "scan_uncached": lambda: ProcessSnapshot({}),
+                "scan_cached": lambda: ProcessSnapshot(cache),
+            }.items():
+                yield {
+                    "suite": "processes",
+                    "name": name,
+                    "processes": processes,
+                    "opens": count_opens(function) / processes,
+                    **measure(function),
+                }
+
+
+def create_procfs(root: str, processes: int):
+    """Create a directory laid out like '/proc' for psutil to read."""
+    with open(os.path.join(root, "stat"), "w", encoding="utf-8") as file:
+        file.write(f"cpu  1 2 3 4\nbtime {BOOT_TIME}\n")
+    for pid in range(100, 100 + processes):
+        os.makedirs(os.path.join(root, str(pid)))
+        path = os.path.join(root, str(pid), "stat")
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(STAT.format(pid=pid, name="worker", started=pid * 100))
+        path = os.path.join(root, str(pid), "cmdline")
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(f"/usr/lib/service-{pid}/bin/worker\0--daemon\0")
+
+
+def scan_without_oneshot() -> dict:
+    """Index processes the way it was done before caching command lines."""
+    index: dict = {}
+    for process in psutil.process_iter():
+        try:
+            if process.status() == psutil.STATUS_ZOMBIE:
+                continue
+            arguments = process.cmdline()
+        except (psutil.AccessDenied, psutil.NoSuchProcess):
+            continue
+        parts = set()
+        for arg in arguments:
+            parts.update(p.lower() for p in arg.split(os.sep))
+        entry = (process, frozenset(parts))
+        for part in parts:
+            index.setdefault(part, []).append(entry)
+    return index
+
+
+def count_opens(function: Callable) -> int:
+    """Count the files opened by a function."""
+    count = 0
+    original = builtins.open
+
+    def counted(*args, **kwargs):
+        nonlocal count
+        count += 1
+        return original(*args, **kwargs)
+
+    with patch.object(builtins, "open", counted):
+        function()
+    return count
@@ -0,0 +1,46 @@
+"""Timings for parsing and serializing the settings file."""
+
+import io
+import os
+import tempfile
+from collections.abc import Iterator
+
+from datafiles import formats
+
+from mine.models import formats as fast
+
+from .fakes import create_data
+from .timing import measure
+
+SIZES = [(10, 2), (100, 10), (1_000, 25), (10_000, 100)]
+
+FORMATTERS = {
+    "ruamel": formats.YAML,
+    "libyaml": fast.YAML,
+}
+
+
+def run(sizes=None) -> Iterator[dict]:
+    """Time each YAML formatter on synthetic settings."""
+    for applications, computers in sizes or SIZES:
+        parameters = {"applications": applications, "computers": computers}
+        with tempfile.TemporaryDirectory() as root:
+            path = os.path.join(root, "mine.yml")
+            data = create_data(path, applications, computers)
+            content = data.datafile.data
+            with open(path, encoding="utf-8") as file:
+                text = file.read()
+
+        for formatter, cls in FORMATTERS.items():
+            yield {
+                "suite": "serialization",
+                "name": f"parse_{formatter}",
+                **parameters,
+                **measure(lambda cls=cls: cls.deserialize(io.StringIO(text))),
+            }
+            yield {
+                "suite": "serialization",
+                "name": f"serialize_{formatter}",
+                **parameters,
+                **measure(lambda cls=cls: cls.serialize(content)),
+            }
@@ -0,0 +1,74 @@
+"""Scans needed to stop applications made of many processes."""
+
+from collections.abc import Iterator
+
+from mine.models import Application
+
+from .fakes import FakeManager
+from .timing import measure
+
+SIZES = [(1, 4), (4, 8), (16, 16), (64, 16)]
+PROCESSES = 600
+HELPER = "/usr/lib/chromium/chrome-sandbox"
+
+
+def run(sizes=None, processes=None) -> Iterator[dict]:
+    """Compare stopping matching processes one at a time against one scan."""
+    processes = processes or PROCESSES
+    application = Application("app")
+    application.versions.linux = "app"
+
+    for instances, helpers in sizes or SIZES:
+        parameters = {
+            "instances": instances,
+            "helpers": helpers,
+            "processes": processes,
+        }
+        for name, function in {
+            "stop_per_instance": stop_per_instance,
+            "stop_tree": lambda manager, application: manager.stop(application),
+        }.items():
+            manager = create_manager(processes, instances, helpers)
+            function(manager, application)
+            remaining = len(manager.processes) - processes
+            managers: list[FakeManager] = []
+            yield {
+                "suite": "stop",
+                "name": name,
+                **parameters,
+                "scans": manager.scans,
+                "remaining": remaining,
+                **measure(
+                    lambda: function(managers[-1], application),
+                    setup=lambda: managers.append(
+                        create_manager(processes, instances, helpers)
+                    ),
+                ),
+            }
+
+
+def create_manager(processes: int, instances: int, helpers: int) -> FakeManager:
+    """Create a process table with instances of an app that start helpers."""
+    manager = FakeManager(processes)
+    for _ in range(instances):
+        parent = manager._add("/usr/bin/app")  # pylint: disable=protected-access
+        for index in range(helpers):
+            if index % 4:
+                cmdline = [HELPER, f"--type=renderer-{index}"]
+            else:
+                cmdline = ["/usr/bin/app", f"--type=gpu-{index}"]
+            manager._add(
+                *cmdline, parent=parent.pid
+            )  # pylint: disable=protected-access
+    return manager
+
+
+def stop_per_instance(manager: FakeManager, application: Application):
+    """Stop processes the way it was done before collecting process trees."""
+    name = application.versions.linux
+    while True:
+        process = manager._get_process(name)  # pylint: disable=protected-access
+        if process is None:
+            break
+        process.terminate()
+        manager.invalidate()
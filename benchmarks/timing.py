@@ -0,0 +1,32 @@
+"""Helpers to time benchmarked functions."""
+
+import contextlib
+import io
+import statistics
+import time
+from collections.abc import Callable
+
+REPEAT = 5
+BUDGET = 5.0  # seconds to spend repeating slow functions
+
+
+def measure(function: Callable, *, setup: Callable | None = None, repeat=REPEAT):
+    """Time a function, excluding its setup and any printed output."""
+    timings: list[float] = []
+    while len(timings) < repeat and sum(timings) < BUDGET:
+        with quiet():
+            if setup:
+                setup()
+            start = time.perf_counter()
+            function()
+            timings.append(time.perf_counter() - start)
+    return {
+        "repeat": len(timings),
+        "best": min(timings),
+        "mean": statistics.mean(timings),
+    }
+
+
+def quiet():
+    """Discard any output printed by the benchmarked code."""
+    return contextlib.redirect_stdout(io.StringIO())
@@ -1,15 +1,24 @@
 """Package for mine."""
 
-from importlib.metadata import PackageNotFoundError, version
+CLI = "mine"
+DESCRIPTION = "Share application state across computers using Dropbox."
 
-try:
-    __version__ = version("mine")
-except PackageNotFoundError:
-    __version__ = "(local)"
 
-del PackageNotFoundError
-del version
+def __getattr__(name):
+    # Reading package metadata is slow, so only do it when the version is used
+    if name == "__version__":
+        from importlib.metadata import (  # pylint: disable=import-outside-toplevel
+            PackageNotFoundError,
+            version,
+        )
 
-CLI = "mine"
-VERSION = f"mine v{__version__}"
-DESCRIPTION = "Share application state across computers using Dropbox."
+        try:
+            value = version("mine")
+        except PackageNotFoundError:
+            value = "(local)"
+    elif name == "VERSION":
+        value = f"mine v{__getattr__('__version__')}"
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
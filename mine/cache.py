@@ -0,0 +1,37 @@
+"""Persistent storage for values that are expensive to compute."""
+
+import json
+import os
+
+import log
+
+DIRECTORY = os.path.join(
+    os.getenv("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "mine"
+)
+
+
+def load(name: str) -> dict:
+    """Read a cached dictionary, returning an empty one when unavailable."""
+    path = os.path.join(DIRECTORY, name + ".json")
+    try:
+        with open(path, encoding="utf-8") as file:
+            data = json.load(file)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        log.debug("Unable to read cache: %s", e)
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def save(name: str, data: dict):
+    """Write a cached dictionary, ignoring any failures."""
+    path = os.path.join(DIRECTORY, name + ".json")
+    temp = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(DIRECTORY, exist_ok=True)
+        with open(temp, "w", encoding="utf-8") as file:
+            json.dump(data, file)
+        os.replace(temp, path)
+    except OSError as e:
+        log.debug("Unable to write cache: %s", e)
@@ -3,16 +3,20 @@
 """Command-line interface."""
 
 import argparse
+import os
 import sys
-import time
+from typing import TYPE_CHECKING
 
-import datafiles
 import log
-from startfile import startfile
 
-from . import CLI, DESCRIPTION, VERSION, common, daemon, services
-from .manager import get_manager
-from .models import Data
+from . import CLI, DESCRIPTION, common, profiler
+
+if TYPE_CHECKING:
+    from .manager import Manager
+    from .models import Data
+
+COMPACT = 1_000  # default status changes before stopped applications are forgotten
+AUTO = "auto"  # daemon delay that adapts to how often the status changes
 
 
 def main(args=None):
@@ -20,7 +24,7 @@ def main(args=None):
 
     # Shared options
     debug = argparse.ArgumentParser(add_help=False)
-    debug.add_argument("-V", "--version", action="version", version=VERSION)
+    debug.add_argument("-V", "--version", action=common.VersionAction)
     group = debug.add_mutually_exclusive_group()
     group.add_argument(
         "-v", "--verbose", action="count", default=0, help="enable verbose logging"
@@ -47,14 +51,19 @@ def main(args=None):
         metavar="DELAY",
         nargs="?",
         const=300,
-        type=int,
-        help="run continuously with delay [seconds]",
+        type=seconds,
+        help=f"run continuously with delay [seconds] or '{AUTO}' to adapt",
     )
     parser.add_argument(
         "-f",
         "--file",
         help="custom settings file path",
     )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help=f"record the time of each phase to {profiler.PATH}",
+    )
     subs = parser.add_subparsers(help="", dest="command", metavar="<command>")
 
     # Build switch parser
@@ -113,6 +122,21 @@ def main(args=None):
         action="store_true",
         help="reset the internal status counter",
     )
+    sub.add_argument(
+        "-c",
+        "--compact",
+        nargs="?",
+        type=int,
+        const=COMPACT,
+        metavar="CHANGES",
+        help="forget applications stopped more than CHANGES status changes ago",
+    )
+    sub.add_argument(
+        "--forget",
+        type=int,
+        metavar="CHANGES",
+        help="forget computers idle for more than CHANGES status changes",
+    )
     sub.add_argument(
         "-s",
         "--stop",
@@ -133,15 +157,26 @@ def main(args=None):
         kwargs["delete"] = True
         kwargs["force"] = args.force
         kwargs["reset"] = args.reset
+        kwargs["compact"] = args.compact
+        kwargs["forget"] = args.forget
         kwargs["stop"] = args.stop
 
     # Configure logging
     common.configure_logging(args.verbose)
+    if args.profile:
+        profiler.enable()
 
     # Run the program
     try:
-        log.debug("Running main command...")
-        success = run(path=args.file, **kwargs)
+        if (
+            "switch" in kwargs
+            and not args.daemon
+            and send_switch(args.file, kwargs["switch"])
+        ):
+            success = True
+        else:
+            log.debug("Running main command...")
+            success = run(path=args.file, **kwargs)
     except KeyboardInterrupt:
         msg = "command canceled"
         if common.verbosity == common.MAX_VERBOSITY:
@@ -165,13 +200,15 @@ def run(
     delete=False,
     force=False,
     reset=False,
+    compact=None,
+    forget=None,
     stop=False,
 ):
     """Run the program.
 
     :param path: custom settings file path
     :param cleanup: remove unused items from the config
-    :param delay: number of seconds to delay before repeating
+    :param delay: number of seconds to delay before repeating or 'auto'
 
     :param switch: computer name to queue for launch
 
@@ -180,75 +217,91 @@ def run(
     :param delete: attempt to delete conflicted files
     :param force: actually delete conflicted files
     :param reset: reset the internal status counter
+    :param compact: status changes after which stopped applications are forgotten
+    :param forget: status changes after which idle computers are forgotten
     :param stop: stop the background daemon process
 
     """
+    # pylint: disable=import-outside-toplevel
+    # Deferred so that parsing arguments stays fast
+    from startfile import startfile
+
+    from . import control, daemon, services
+    from .engine import Engine
+    from .manager import get_manager
+    from .models import Data
+    from .watcher import Watcher
+
     manager = get_manager()
     if not manager.is_running(services.APPLICATION):
         manager.start(services.APPLICATION)
 
     root = services.find_root()
     path = path or services.find_config_path(root=root)
-    data = Data(path)
+    with profiler.phase("load"):
+        data = Data(path)
 
     log.info("Identifying current computer...")
-    with datafiles.frozen(data):
+    with profiler.phase("identity"), data.transaction():
         computer = data.config.get_current_computer()
     log.info("Current computer: %s", computer)
+    data.use_shards(computer)
 
     if stop:
         daemon.stop(manager)
     if reset:
-        with datafiles.frozen(data):
+        with data.transaction():
             data.prune_status(reset_counter=True)
+    if compact is not None or forget is not None:
+        with data.transaction():
+            data.status.compact(compact, forget)
     if edit:
         return startfile(path)
     if delete:
+        if force:
+            services.merge_conflicts(data)
         return services.delete_conflicts(root, force=force)
 
-    if switch is True:
-        switch = computer
-    elif switch is False:
-        data.close_all_applications(manager)
-    elif switch:
-        switch = data.config.match_computer(switch)
+    switch_computers(data, manager, computer, switch)
 
-    if switch:
-        if switch != computer:
-            data.close_all_applications(manager)
-        data.queue_all_applications(switch)
-
-    while True:
-        if services.delete_conflicts(root, config_only=True, force=True):
-            log.info("Delaying 10 seconds for changes to delete...")
-            time.sleep(10)
-        with datafiles.frozen(data):
-            data.launch_queued_applications(computer, manager)
-            data.update_status(computer, manager)
-
-        if delay is None or delay <= 0:
-            break
-
-        if data.modified:
-            log.info("Delaying 10 seconds for changes to upload...")
-            time.sleep(10)
-
-        elapsed = 0
-        log.info(f"Waiting up to {delay} seconds for changes...")
-        while elapsed < delay:
-            time.sleep(5)
-            elapsed += 5
-            if data.modified:
-                log.info(f"Status changed after {elapsed} seconds")
-                log.info("Delaying 10 seconds for changes to download...")
-                time.sleep(10)
-                break
-        else:
-            log.info(f"No status change after {elapsed} seconds")
+    def handle(request: dict) -> dict:
+        if request.get("command") != "switch":
+            return {"ok": False, "error": f"Unknown command: {request}"}
+        if request.get("path") not in (None, os.path.abspath(path)):
+            return {"ok": False, "error": f"Daemon is using {path}"}
+
+        data.reload()
+        manager.invalidate()
+        target = switch_computers(data, manager, computer, request.get("switch"))
+        engine.wake()  # applications are launched by the daemon's own task
+
+        return {"ok": True, "computer": str(target) if target else None}
+
+    if delay == AUTO or delay and delay > 0:
+        directories = [data.shards.directory] if data.shards else []
+        watcher = Watcher(path, directories=directories)
+        with watcher, control.Server() as server:
+            interval = None if delay == AUTO else delay
+            engine = Engine(data, manager, computer, interval, watcher, server, handle)
+            engine.run()
+    else:
+        manager.invalidate()
+        with profiler.phase("conflicts"):
+            merged = services.merge_conflicts(data)
+        if merged:
+            log.info("Waiting for merged changes to upload...")
+            with profiler.phase("settle"):
+                services.settle(path)
+        with data.transaction():
+            with profiler.phase("launch"):
+                data.launch_queued_applications(computer, manager)
+            with profiler.phase("update"):
+                data.update_status(computer, manager)
 
     if cleanup:
-        with datafiles.frozen(data):
+        with data.transaction():
             data.prune_status()
+    profiler.flush()
 
     if delay is None:
         return daemon.restart(manager)
@@ -256,5 +309,48 @@ def run(
     return True
 
 
+def seconds(value: str):
+    """Parse a daemon delay, which may also adapt automatically."""
+    return value if value == AUTO else int(value)
+
+
+def switch_computers(data: "Data", manager: "Manager", computer, switch):
+    """Queue applications to start on a computer, closing them here if needed."""
+    with data.transaction():
+        if switch is True:
+            switch = computer
+        elif switch is False:
+            data.close_all_applications(manager)
+        elif switch:
+            switch = data.config.match_computer(switch)
+
+        if switch:
+            if switch != computer:
+                data.close_all_applications(manager)
+            data.queue_all_applications(switch)
+
+    return switch
+
+
+def send_switch(path, switch) -> bool:
+    """Ask a running daemon to switch computers, returning False if unavailable."""
+    from . import control  # pylint: disable=import-outside-toplevel
+
+    request = {
+        "command": "switch",
+        "switch": switch,
+        "path": os.path.abspath(path) if path else None,
+    }
+    reply = control.send(request)
+    if reply is None:
+        return False
+    if not reply.get("ok"):
+        log.warning("Daemon was unable to switch: %s", reply.get("error"))
+        return False
+
+    log.info("Daemon switched to: %s", reply.get("computer"))
+    return True
+
+
 if __name__ == "__main__":
     main()
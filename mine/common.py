@@ -18,6 +18,21 @@ class HelpFormatter(argparse.HelpFormatter):
         super().__init__(*args, **kwargs)
 
 
+class VersionAction(argparse.Action):
+    """Command-line action that looks up the version only when displayed."""
+
+    def __init__(self, option_strings, dest=argparse.SUPPRESS, **kwargs):
+        kwargs.setdefault("help", "show program's version number and exit")
+        super().__init__(
+            option_strings, dest, default=argparse.SUPPRESS, nargs=0, **kwargs
+        )
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        from . import VERSION  # pylint: disable=import-outside-toplevel
+
+        parser.exit(message=VERSION + "\n")
+
+
 class WarningFormatter(logging.Formatter):
     """Logging formatter that displays verbose formatting for WARNING+."""
 
@@ -0,0 +1,140 @@
+"""Local socket to send commands to a running daemon."""
+
+import json
+import os
+import socket
+import tempfile
+from collections.abc import Callable
+
+import log
+
+PATH = os.path.join(
+    os.getenv("XDG_RUNTIME_DIR") or tempfile.gettempdir(),
+    f"mine-{os.getuid()}.sock" if hasattr(os, "getuid") else "mine.sock",
+)
+TIMEOUT = 60.0  # seconds to wait for the daemon to finish a command
+
+
+def available() -> bool:
+    """Determine if the platform supports local sockets."""
+    return hasattr(socket, "AF_UNIX")
+
+
+def send(request: dict, path: str = "", timeout: float = TIMEOUT) -> dict | None:
+    """Send a request to the daemon, returning None when it is not listening."""
+    if not available():
+        return None
+
+    path = path or PATH
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(timeout)
+            client.connect(path)
+            client.sendall(json.dumps(request).encode() + b"\n")
+            with client.makefile("rb") as file:
+                line = file.readline()
+    except OSError as e:
+        log.debug("Unable to reach the daemon: %s", e)
+        return None
+
+    try:
+        reply = json.loads(line)
+    except ValueError:
+        log.debug("Invalid reply from the daemon: %r", line)
+        return None
+    return reply if isinstance(reply, dict) else None
+
+
+class Server:
+    """Accept requests from other commands on a local socket."""
+
+    def __init__(self, path: str = ""):
+        self.path = path or PATH
+        self._socket: socket.socket | None = None
+        if available():
+            self._socket = self._listen(self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    @property
+    def listening(self) -> bool:
+        """Determine if requests can be received."""
+        return self._socket is not None
+
+    def fileno(self) -> int:
+        """Get the file descriptor to wait on for new requests."""
+        assert self._socket is not None
+        return self._socket.fileno()
+
+    def close(self):
+        """Stop accepting requests and remove the socket."""
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+
+    def handle(self, callback: Callable[[dict], dict]) -> int:
+        """Reply to every pending request, returning how many were handled."""
+        count = 0
+        while self._socket is not None:
+            try:
+                connection, _ = self._socket.accept()
+            except BlockingIOError:
+                break
+            with connection:
+                connection.settimeout(1)
+                try:
+                    with connection.makefile("rb") as file:
+                        request = json.loads(file.readline())
+                except (OSError, ValueError) as e:
+                    log.warning("Invalid request: %s", e)
+                    continue
+
+                log.info("Received request: %s", request)
+                try:
+                    if request.get("command") == "ping":
+                        reply = {"ok": True}
+                    else:
+                        reply = callback(request)
+                except Exception as e:  # pylint: disable=broad-except
+                    log.error("Unable to handle request: %s", e)
+                    reply = {"ok": False, "error": str(e)}
+                count += 1
+
+                try:
+                    connection.sendall(json.dumps(reply).encode() + b"\n")
+                except OSError as e:
+                    log.warning("Unable to reply: %s", e)
+        return count
+
+    @staticmethod
+    def _listen(path: str) -> socket.socket | None:
+        if os.path.exists(path):
+            if send({"command": "ping"}, path, timeout=1) is not None:
+                log.warning("Another daemon is listening: %s", path)
+                return None
+            log.debug("Removing stale socket: %s", path)
+            os.remove(path)
+
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        umask = os.umask(0o177)
+        try:
+            server.bind(path)
+            server.listen()
+        except OSError as e:
+            server.close()
+            log.warning("Unable to listen for commands: %s", e)
+            return None
+        finally:
+            os.umask(umask)
+        server.setblocking(False)
+
+        log.debug("Listening for commands: %s", path)
+        return server
@@ -20,6 +20,7 @@ def restart(manager: Manager):
 
         log.info("$ %s", cmd)
         subprocess.call(cmd, shell=True)
+        manager.invalidate()
         if manager.is_running(application):
             return True
 
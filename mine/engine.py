@@ -0,0 +1,264 @@
+"""Daemon that runs its work as cooperating asyncio tasks."""
+
+import asyncio
+import functools
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
+import log
+
+from . import profiler, services
+from .manager import ProcessEvents
+
+if TYPE_CHECKING:
+    from .control import Server
+    from .manager import Manager
+    from .models import Data
+    from .watcher import Watcher
+
+WORKERS = 4  # threads for blocking process and filesystem calls
+
+
+class Schedule:
+    """Time between cycles, adapted to how often the status changes.
+
+    After a change, cycles run at the minimum interval for a burst of
+    cycles. Once nothing has changed for a few cycles, the interval doubles
+    each cycle until it reaches the maximum.
+
+    """
+
+    MINIMUM = 15.0  # seconds between cycles after a change
+    MAXIMUM = 900.0  # seconds between cycles when idle
+    BURST = 8  # cycles to keep the minimum interval after a change
+    IDLE = 4  # unchanged cycles before backing off
+    FACTOR = 2.0
+
+    def __init__(self, delay: float | None = None):
+        """Create a schedule.
+
+        :param delay: fixed seconds between cycles, otherwise adapt
+
+        """
+        self.adaptive = delay is None
+        self.interval = self.MINIMUM if delay is None else float(delay)
+        self._burst = 0
+        self._idle = 0
+
+    def changed(self):
+        """Shorten the interval after a status change or queued switch."""
+        if self.adaptive:
+            self.interval = self.MINIMUM
+            self._burst = self.BURST
+            self._idle = 0
+
+    def next(self) -> float:
+        """Get the seconds until the next cycle."""
+        if self.adaptive:
+            if self._burst:
+                self._burst -= 1
+            else:
+                self._idle += 1
+                if self._idle > self.IDLE:
+                    self.interval = min(self.interval * self.FACTOR, self.MAXIMUM)
+        return self.interval
+
+
+class Engine:
+    """Keep applications in sync on this computer until interrupted.
+
+    Each kind of work runs as its own task:
+
+    - the file waiter notices settings changed by other computers
+    - the process monitor records applications starting and stopping
+    - the launcher starts and stops applications for the latest settings
+    - the sweeper merges conflicted copies of the settings file
+
+    Blocking calls run in a bounded thread pool and only one task reads or
+    writes the settings at a time. Applications finish stopping in the
+    background, so requests are still handled while they exit.
+
+    """
+
+    def __init__(
+        self,
+        data: "Data",
+        manager: "Manager",
+        computer,
+        delay: float | None,
+        watcher: "Watcher",
+        server: "Server | None" = None,
+        handle: Callable[[dict], dict] | None = None,
+    ):
+        self.data = data
+        self.manager = manager
+        self.computer = computer
+        self.schedule = Schedule(delay)
+        self.watcher = watcher
+        self.server = server
+        self.handle = handle
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock: asyncio.Lock | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._rescheduled: asyncio.Event | None = None
+
+    def run(self, duration: float | None = None):
+        """Run every task until interrupted or the duration passes."""
+        asyncio.run(self._run(duration))
+
+    def wake(self):
+        """Ask the launcher to act on the settings, from any thread."""
+        if self._loop and self._wakeup:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    async def _run(self, duration: float | None):
+        self._loop = asyncio.get_running_loop()
+        self._lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._rescheduled = asyncio.Event()
+        self.manager.watch()
+        with ThreadPoolExecutor(WORKERS, thread_name_prefix="mine") as executor:
+            self._executor = self.manager.executor = executor
+            tasks = [
+                asyncio.create_task(coroutine)
+                for coroutine in (
+                    self._wait_for_changes(),
+                    self._monitor_processes(),
+                    self._launch(),
+                    self._sweep(),
+                    self._serve(),
+                )
+            ]
+            try:
+                done, _ = await asyncio.wait(
+                    tasks, timeout=duration, return_when=asyncio.FIRST_EXCEPTION
+                )
+                for task in done:
+                    task.result()
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                self.manager.executor = None
+
+    async def _wait_for_changes(self):
+        while True:
+            await self._changed()
+            if await self._locked(self._modified):
+                self._reschedule()
+                log.info("Waiting for changes to download...")
+                await self._call(self._settle)
+                self.wake()
+
+    async def _monitor_processes(self):
+        while True:
+            await asyncio.sleep(ProcessEvents.INTERVAL)
+            if await self._locked(self._react):
+                self._reschedule()
+
+    async def _launch(self):
+        assert self._wakeup
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            if await self._locked(self._cycle):
+                self._reschedule()
+
+    async def _sweep(self):
+        while True:
+            if await self._locked(self._merge_conflicts):
+                log.info("Waiting for merged changes to upload...")
+                await self._call(self._settle)
+            self.wake()
+            await self._pause()
+
+    async def _serve(self):
+        if self.server is None or not self.server.listening or not self.handle:
+            return
+        while True:
+            await self._readable(self.server.fileno())
+            await self._locked(self.server.handle, self.handle)
+
+    async def _pause(self):
+        assert self._loop and self._rescheduled
+        interval = self.schedule.next()
+        log.info(f"Checking again in {interval:g} seconds")
+        start = self._loop.time()
+        deadline = start + interval
+        while (remaining := deadline - self._loop.time()) > 0:
+            self._rescheduled.clear()
+            try:
+                await asyncio.wait_for(self._rescheduled.wait(), remaining)
+            except TimeoutError:
+                break
+            deadline = min(deadline, start + self.schedule.interval)
+
+    def _reschedule(self):
+        assert self._rescheduled
+        if self.schedule.adaptive:
+            self.schedule.changed()
+            self._rescheduled.set()
+
+    async def _changed(self):
+        if self.watcher.polling:
+            while not await self._call(self.watcher.check):
+                await asyncio.sleep(self.watcher.interval)
+        else:
+            while not self.watcher.check():
+                await self._readable(self.watcher.fileno())
+
+    async def _readable(self, fd: int):
+        assert self._loop
+        ready = self._loop.create_future()
+
+        def notify():
+            if not ready.done():
+                ready.set_result(None)
+
+        self._loop.add_reader(fd, notify)
+        try:
+            await ready
+        finally:
+            self._loop.remove_reader(fd)
+
+    async def _call(self, function, *args):
+        assert self._loop
+        call = functools.partial(function, *args)
+        return await self._loop.run_in_executor(self._executor, call)
+
+    async def _locked(self, function, *args):
+        assert self._lock
+        async with self._lock:
+            return await self._call(function, *args)
+
+    def _modified(self) -> bool:
+        with profiler.phase("load"):
+            return self.data.modified
+
+    def _settle(self) -> bool:
+        with profiler.phase("settle"):
+            return services.settle(self.watcher.path, self.watcher.directories)
+
+    def _react(self) -> bool:
+        if self.manager.refresh(self.data.config.applications):
+            with self.data.transaction():
+                self.data.update_status(self.computer, self.manager)
+            return self.data.modified
+        return False
+
+    def _cycle(self) -> bool:
+        self.manager.invalidate()
+        with self.data.transaction():
+            with profiler.phase("launch"):
+                self.data.launch_queued_applications(self.computer, self.manager)
+            with profiler.phase("update"):
+                self.data.update_status(self.computer, self.manager)
+        modified = self.data.modified
+        profiler.flush()
+        return modified
+
+    def _merge_conflicts(self) -> int:
+        with profiler.phase("conflicts"):
+            return services.merge_conflicts(self.data)
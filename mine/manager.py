@@ -5,11 +5,16 @@ import functools
 import glob
 import os
 import platform
+import subprocess
+import threading
 import time
+from concurrent.futures import Executor, ThreadPoolExecutor
 
 import log
 import psutil
 
+from . import profiler
+
 
 def log_running(func):
     @functools.wraps(func)
@@ -50,13 +55,184 @@ def log_stopping(func):
     return wrapped
 
 
+def terminate(processes, timeout: float):
+    """Ask processes to exit together, killing any still running after a timeout."""
+    for process in processes:
+        try:
+            process.terminate()
+        except psutil.NoSuchProcess:
+            pass
+    _gone, alive = psutil.wait_procs(processes, timeout=timeout)
+    for process in alive:
+        log.warning("Killing unresponsive process: %s", process)
+        try:
+            process.kill()
+        except psutil.NoSuchProcess:
+            pass
+    if alive:
+        psutil.wait_procs(alive, timeout=timeout)
+
+
+class ProcessSnapshot:
+    """Index of running processes by the components of their command lines."""
+
+    def __init__(self, cache: dict | None = None):
+        """Scan running processes.
+
+        :param cache: command line parts from a previous scan, which is
+            updated in place to contain only the processes seen in this one
+
+        """
+        self._index: dict[str, list[tuple[psutil.Process, frozenset[str]]]] = {}
+        self._entries: dict[int, tuple[psutil.Process, frozenset[str]]] = {}
+        self._parents: dict[int, int] = {}
+        self._children: dict[int, list[int]] = {}
+        self._previous = {} if cache is None else cache
+        self._cache: dict = {}
+
+        log.debug("Indexing running processes...")
+        for process in psutil.process_iter():
+            self._add(process)
+
+        if cache is not None:
+            cache.clear()
+            cache.update(self._cache)
+            self._previous = self._cache = cache
+        log.debug("Indexed %s running processes", self.count)
+
+    @property
+    def count(self) -> int:
+        """Get the number of indexed processes."""
+        return len(self._entries)
+
+    def find(self, name: str, ignored=()):
+        """Get all processes whose executable path contains an app name."""
+        processes = []
+        for process, parts in self._index.get(name.lower(), []):
+            for ignored_name in ignored:
+                if ignored_name.lower() in parts:
+                    log.debug("Skipped process due to ignored name: %s", process)
+                    break
+            else:
+                processes.append(process)
+        return processes
+
+    def tree(self, processes) -> list[psutil.Process]:
+        """Get processes followed by all of their descendants, each only once."""
+        group = {process.pid: process for process in processes}
+        queue = list(group.values())
+        for process in queue:
+            for pid in self._children.get(process.pid, ()):
+                if pid not in group:
+                    group[pid] = child = self._entries[pid][0]
+                    queue.append(child)
+        return queue
+
+    def update(self, started=(), stopped=()) -> set[str]:
+        """Index started processes and remove stopped process IDs.
+
+        :return: command line parts of every added or removed process
+
+        """
+        changed: set[str] = set()
+        for pid in stopped:
+            entry = self._entries.pop(pid, None)
+            if entry:
+                for part in entry[1]:
+                    self._index[part].remove(entry)
+                siblings = self._children.get(self._parents.pop(pid), [])
+                if pid in siblings:
+                    siblings.remove(pid)
+                self._children.pop(pid, None)  # orphans are adopted by others
+                changed.update(entry[1])
+        for process in started:
+            entry = self._add(process)
+            if entry:
+                changed.update(entry[1])
+        return changed
+
+    def _add(self, process: psutil.Process):
+        if process.pid == os.getpid() or process.pid in self._entries:
+            return None
+        try:
+            with process.oneshot():  # read each '/proc/<pid>/stat' once
+                status = process.status()
+                name = process.name()
+                created = process.create_time()
+                parent = process.ppid()
+        except psutil.AccessDenied:
+            return None  # the process is likely owned by root
+        except psutil.NoSuchProcess:
+            return None  # the process exited while scanning
+        if status == psutil.STATUS_ZOMBIE:
+            log.debug("Skipped zombie process: %s", process)
+            return None
+
+        # The name changes when a process replaces its program
+        key = (process.pid, created, name)
+        parts = self._previous.get(key)
+        if parts is None:
+            try:
+                arguments = process.cmdline()
+            except psutil.AccessDenied:
+                return None  # the process is likely owned by root
+            except psutil.NoSuchProcess:
+                return None  # the process exited while scanning
+            parts = frozenset(
+                part.lower() for arg in arguments for part in arg.split(os.sep)
+            )
+        self._cache[key] = parts
+
+        entry = (process, parts)
+        for part in parts:
+            self._index.setdefault(part, []).append(entry)
+        self._entries[process.pid] = entry
+        self._parents[process.pid] = parent
+        self._children.setdefault(parent, []).append(process.pid)
+        return entry
+
+
+class ProcessEvents:
+    """Detect started and stopped processes by comparing process IDs."""
+
+    INTERVAL = 2.0  # seconds between checks while waiting
+
+    def __init__(self):
+        self._pids = set(psutil.pids())
+
+    def poll(self) -> tuple[list[psutil.Process], set[int]]:
+        """Get the processes started and IDs stopped since the last poll."""
+        pids = set(psutil.pids())
+        started = []
+        for pid in pids - self._pids:
+            try:
+                started.append(psutil.Process(pid))
+            except psutil.NoSuchProcess:
+                pids.discard(pid)
+        stopped = self._pids - pids
+        self._pids = pids
+        return started, stopped
+
+
 class Manager(metaclass=abc.ABCMeta):  # pragma: no cover (abstract)
     """Base application manager."""
 
     NAME = FRIENDLY = ""
 
+    TIMEOUT = 5.0  # seconds to wait for applications to exit before killing them
+    LAUNCH_TIMEOUT = 10.0  # seconds to wait for a started application to appear
+    LAUNCH_INTERVAL = 0.25  # seconds between checks for started applications
+    LAUNCH_WORKERS = 8
+
     IGNORED_APPLICATION_NAMES: list[str] = []
 
+    _snapshot: ProcessSnapshot | None = None
+    _cmdlines: dict | None = None
+    _stopping: frozenset[int] = frozenset()  # processes exiting in the background
+    _lock = threading.Lock()
+    events: ProcessEvents | None = None
+    executor: Executor | None = None  # when set, stops finish in the background
+
     def __str__(self):
         return self.FRIENDLY
 
@@ -65,50 +241,157 @@ class Manager(metaclass=abc.ABCMeta):  # pragma: no cover (abstract)
         """Determine if an application is currently running."""
         raise NotImplementedError
 
-    @abc.abstractmethod
+    @log_starting
     def start(self, application):
         """Start an application on the current computer."""
-        raise NotImplementedError
+        return bool(self.start_all([application]))
 
     @abc.abstractmethod
     def stop(self, application):
         """Stop an application on the current computer."""
         raise NotImplementedError
 
-    @classmethod
-    def _get_process(cls, name: str):
-        """Get a process whose executable path contains an app name."""
-        log.debug("Searching for exe path containing '%s'...", name)
-
-        for process in psutil.process_iter():
-            if process.status() == psutil.STATUS_ZOMBIE:
-                log.debug("Skipped zombie process: %s", process)
+    def start_all(self, applications, timeout: float | None = None) -> list:
+        """Start many applications at once, waiting until each one is running.
+
+        :return: applications that appeared before their timeout
+
+        """
+        applications = list(applications)
+        if not applications:
+            return []
+        timeout = self.LAUNCH_TIMEOUT if timeout is None else timeout
+
+        def launch(application):
+            if self._launch(application) is None:
+                return None
+            return time.monotonic() + timeout
+
+        workers = min(len(applications), self.LAUNCH_WORKERS)
+        with ThreadPoolExecutor(workers, thread_name_prefix="launch") as pool:
+            deadlines = list(zip(applications, pool.map(launch, applications)))
+
+        ready: list = []
+        pending = [(a, d) for a, d in deadlines if d is not None]
+        while pending:
+            self.invalidate()
+            waiting = []
+            for application, deadline in pending:
+                if self._get_process(self._get_name(application)):
+                    log.debug("Started: %s", application)
+                    ready.append(application)
+                elif time.monotonic() > deadline:
+                    log.warning("Timed out waiting for %s to start", application)
+                else:
+                    waiting.append((application, deadline))
+            pending = waiting
+            if pending:
+                time.sleep(self.LAUNCH_INTERVAL)
+        return ready
+
+    def stop_all(self, applications, timeout: float | None = None):
+        """Stop many applications at once, waiting only as long as the slowest."""
+        processes: list[psutil.Process] = []
+        for application in applications:
+            name = self._get_name(application)
+            if not name:
                 continue
+            log.info("Stopping %s...", application)
+            processes.extend(self._get_processes(name))
+        if processes:
+            group = self.snapshot.tree(processes)
+            self._terminate(group, self.TIMEOUT if timeout is None else timeout)
+
+    @property
+    def snapshot(self) -> ProcessSnapshot:
+        """Get the index of running processes, scanning them if needed."""
+        if self._snapshot is None:
+            if self._cmdlines is None:
+                self._cmdlines = {}
+            with profiler.phase("processes"):
+                self._snapshot = ProcessSnapshot(self._cmdlines)
+        return self._snapshot
+
+    def invalidate(self):
+        """Discard the index of running processes to force a new scan."""
+        self._snapshot = None
+
+    def watch(self, events: ProcessEvents | None = None):
+        """Start tracking process changes between scans."""
+        self.events = events or ProcessEvents()
+
+    def refresh(self, applications) -> bool:
+        """Apply process changes since the last poll to the index.
+
+        :return: True if any of the applications started or stopped
+
+        """
+        if self.events is None:
+            return False
+        started, stopped = self.events.poll()
+        if self._snapshot is None or not (started or stopped):
+            return False
+        parts = self._snapshot.update(started, stopped)
+        for application in applications:
+            name = self._get_name(application)
+            if name and name.lower() in parts:
+                log.info("Process change detected: %s", application)
+                return True
+        return False
+
+    def _get_name(self, application) -> str | None:
+        """Get the name used to find an application's processes."""
+        return None
 
-            try:
-                command = " ".join(process.cmdline()).lower()
-                parts = []
-                for arg in process.cmdline():
-                    parts.extend([p.lower() for p in arg.split(os.sep)])
-            except psutil.AccessDenied:
-                continue  # the process is likely owned by root
+    @abc.abstractmethod
+    def _launch(self, application):
+        """Begin starting an application, returning None if it cannot start."""
+        raise NotImplementedError
 
-            if name.lower() not in parts:
-                continue
+    def _get_processes(self, name: str):
+        """Get all processes whose executable path contains an app name."""
+        log.debug("Searching for exe path containing '%s'...", name)
+        processes = [
+            process
+            for process in self.snapshot.find(name, self.IGNORED_APPLICATION_NAMES)
+            if process.pid not in self._stopping
+        ]
+        for process in processes:
+            log.debug("Found matching process: %s", process)
+        return processes
+
+    def _get_process(self, name: str):
+        """Get a process whose executable path contains an app name."""
+        processes = self._get_processes(name)
+        return processes[0] if processes else None
 
-            if process.pid == os.getpid():
-                log.debug("Skipped current process: %s", command)
-                continue
+    def _stop_processes(self, name: str):
+        """Terminate every process whose executable path contains an app name.
 
-            log.debug("Found matching process: %s", command)
-            for ignored in cls.IGNORED_APPLICATION_NAMES:
-                if ignored.lower() in parts:
-                    log.debug("But skipped due to ignored name")
-                    break
-            else:
-                return process
+        Helper processes started by them are stopped too, all from one scan.
 
-        return None
+        """
+        processes = self._get_processes(name)
+        if processes:
+            self._terminate(self.snapshot.tree(processes), self.TIMEOUT)
+
+    def _terminate(self, processes, timeout: float):
+        """Stop processes, treating them as stopped while they exit if deferred."""
+        if self.executor is None:
+            terminate(processes, timeout)
+        else:
+            pids = frozenset(process.pid for process in processes)
+            with self._lock:
+                self._stopping |= pids
+            future = self.executor.submit(terminate, processes, timeout)
+            future.add_done_callback(functools.partial(self._finish, pids))
+        self.invalidate()
+
+    def _finish(self, pids: frozenset[int], future):
+        with self._lock:
+            self._stopping -= pids
+        if not future.cancelled() and future.exception():
+            log.error("Unable to stop processes: %s", future.exception())
 
 
 class LinuxManager(Manager):  # pragma: no cover (manual)
@@ -124,18 +407,28 @@ class LinuxManager(Manager):  # pragma: no cover (manual)
         process = self._get_process(name)
         return process is not None
 
-    def start(self, application):
-        pass
-
     def stop(self, application):
         name = application.versions.linux
-        while True:
-            process = self._get_process(name)
-            if process and process.is_running():
-                process.terminate()
-                process.wait()
-            else:
-                break
+        self._stop_processes(name)
+
+    def _get_name(self, application):
+        return application.versions.linux
+
+    def _launch(self, application):
+        name = application.versions.linux
+        if not name:
+            return None
+        try:
+            return subprocess.Popen(  # pylint: disable=consider-using-with
+                [name],
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                start_new_session=True,
+            )
+        except OSError as e:
+            log.error("Unable to start %s: %s", application, e)
+            return None
 
 
 class MacManager(Manager):  # pragma: no cover (manual)
@@ -167,9 +460,18 @@ class MacManager(Manager):  # pragma: no cover (manual)
         process = self._get_process(name)
         return process is not None
 
-    @log_starting
-    def start(self, application):
+    @log_stopping
+    def stop(self, application):
+        name = application.versions.mac
+        self._stop_processes(name)
+
+    def _get_name(self, application):
+        return application.versions.mac
+
+    def _launch(self, application):
         name = application.versions.mac
+        if not name:
+            return None
         path = None
         for base in (
             ".",
@@ -189,24 +491,11 @@ class MacManager(Manager):  # pragma: no cover (manual)
             assert path, "Not found: {}".format(application)
         return self._start_app(path)
 
-    @log_stopping
-    def stop(self, application):
-        name = application.versions.mac
-        while True:
-            process = self._get_process(name)
-            if process and process.is_running():
-                process.terminate()
-                process.wait()
-            else:
-                break
-
     @staticmethod
     def _start_app(path):
         """Start an application from it's .app directory."""
         assert os.path.exists(path), path
-        process = psutil.Popen(["open", path])
-        time.sleep(1)
-        return process
+        return psutil.Popen(["open", path])
 
 
 class WindowsManager(Manager):  # pragma: no cover (manual)
@@ -218,10 +507,10 @@ class WindowsManager(Manager):  # pragma: no cover (manual)
     def is_running(self, application):
         pass
 
-    def start(self, application):
+    def stop(self, application):
         pass
 
-    def stop(self, application):
+    def _launch(self, application):
         pass
 
 
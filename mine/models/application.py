@@ -2,9 +2,12 @@
 
 from dataclasses import dataclass, field
 
+from .base import Model
+from .index import Keyed
 
-@dataclass
-class Versions:
+
+@dataclass(slots=True)
+class Versions(Model):
     """Dictionary of OS-specific application filenames."""
 
     mac: str | None = None
@@ -12,8 +15,8 @@ class Versions:
     linux: str | None = None
 
 
-@dataclass
-class Properties:
+@dataclass(slots=True)
+class Properties(Model):
     """Dictionary of application management settings."""
 
     auto_queue: bool = False
@@ -21,10 +24,12 @@ class Properties:
     keep_running: bool = False
 
 
-@dataclass
-class Application:
+@dataclass(slots=True)
+class Application(Keyed, Model):
     """Dictionary of application information."""
 
+    KEY = "name"
+
     name: str
     properties: Properties = field(default_factory=Properties)
     versions: Versions = field(default_factory=Versions)
@@ -0,0 +1,39 @@
+"""Common base for compact data structures."""
+
+import dataclasses
+import functools
+from types import SimpleNamespace
+
+from datafiles.converters import map_type
+
+
+class Meta:
+    """Datafiles options that share one converter mapping per class."""
+
+    def __get__(self, instance, cls):
+        return get_meta(cls)
+
+
+@functools.cache
+def get_meta(cls: type) -> SimpleNamespace:
+    """Map a model's fields to converters, which datafiles would do per object."""
+    attrs = {
+        field.name: map_type(field.type, name=field.name)
+        for field in dataclasses.fields(cls)
+        if field.init
+    }
+    return SimpleNamespace(datafile_attrs=attrs)
+
+
+class Model:
+    """Base for slotted dataclasses that datafiles can still track.
+
+    Settings can hold tens of thousands of nested items, so each one stores
+    its fields in slots rather than a per-instance dictionary. The only
+    extra attribute datafiles assigns is the mapper used to track changes.
+
+    """
+
+    __slots__ = ("datafile",)
+
+    Meta = Meta()
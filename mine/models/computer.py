@@ -6,15 +6,27 @@ import re
 import socket
 import subprocess
 import uuid
+from contextlib import suppress
 from dataclasses import dataclass
 
-from .. import __version__
+import log
+import psutil
 
+from .. import __version__, cache
+from .base import Model
+from .index import Keyed
 
-@dataclass
-class Computer:
+BOOT_ID = "/proc/sys/kernel/random/boot_id"
+DISK_BY_ID = "/dev/disk/by-id"
+SYS_BLOCK = "/sys/block"
+
+
+@dataclass(slots=True)
+class Computer(Keyed, Model):
     """A dictionary of identifying computer information."""
 
+    KEY = "name"
+
     name: str
     serial: str = ""
     address: str = ""
@@ -22,9 +34,11 @@ class Computer:
     mine: str = "v" + __version__
 
     def __post_init__(self):
-        self.address = self.address or self.get_address()
+        if not (self.address and self.serial):
+            identity = get_identity()
+            self.address = self.address or identity["address"]
+            self.serial = self.serial or identity["serial"]
         self.hostname = self.hostname or self.get_hostname()
-        self.serial = self.serial or self.get_serial()
         assert ":" in self.address, f"Invalid address: {self.address!r}"
 
     def __str__(self):
@@ -42,8 +56,7 @@ class Computer:
     @staticmethod
     def get_address():
         """Get this computer's MAC address."""
-        node = uuid.getnode()
-        return ":".join(("%012X" % node)[i : i + 2] for i in range(0, 12, 2))
+        return get_identity()["address"]
 
     @staticmethod
     def get_hostname():
@@ -53,26 +66,88 @@ class Computer:
     @staticmethod
     def get_serial():
         """Get this computer's storage serial number."""
-        if os.name == "nt":
-            cmd = "vol C:"
-            output = os.popen(cmd).read()
-            return re.findall("Volume Serial Number is (.+)", output)[0]
-
-        if platform.system() == "Darwin":
-            args = ["/usr/sbin/ioreg", "-l"]
-            try:
-                output = subprocess.check_output(args).decode("utf-8", "ignore")
-                serial_number_match = re.search(
-                    '"IOPlatformSerialNumber" = "(.*?)"', output
-                )
-                if serial_number_match:
-                    return serial_number_match.group(1)
-            except UnicodeDecodeError:
-                return None
-
-        cmd = "/sbin/udevadm info --query=property --name=sda"
+        return get_identity()["serial"]
+
+
+def get_identity() -> dict:
+    """Get this computer's identifying information, cached until it changes."""
+    boot = get_boot_id()
+    hostname = socket.gethostname()
+
+    identity = cache.load("identity")
+    if identity.get("boot") == boot and identity.get("hostname") == hostname:
+        return identity
+
+    log.debug("Detecting identifying information...")
+    identity = {
+        "boot": boot,
+        "hostname": hostname,
+        "address": detect_address(),
+        "serial": detect_serial(),
+    }
+    cache.save("identity", identity)
+    return identity
+
+
+def get_boot_id() -> str:
+    """Get a value that changes every time this computer restarts."""
+    with suppress(OSError):
+        with open(BOOT_ID, encoding="utf-8") as file:
+            return file.read().strip()
+    return str(psutil.boot_time())
+
+
+def detect_address() -> str:
+    """Get this computer's MAC address from the network interface."""
+    node = uuid.getnode()
+    return ":".join(("%012X" % node)[i : i + 2] for i in range(0, 12, 2))
+
+
+def detect_serial() -> str | None:
+    """Get this computer's storage serial number from the operating system."""
+    if os.name == "nt":
+        cmd = "vol C:"
         output = os.popen(cmd).read()
-        serial_numbers = re.findall("ID_SERIAL=(.+)", output)
-        if serial_numbers:
-            return serial_numbers[0]
-        return None
+        return re.findall("Volume Serial Number is (.+)", output)[0]
+
+    if platform.system() == "Darwin":
+        args = ["/usr/sbin/ioreg", "-l"]
+        try:
+            output = subprocess.check_output(args).decode("utf-8", "ignore")
+            serial_number_match = re.search(
+                '"IOPlatformSerialNumber" = "(.*?)"', output
+            )
+            if serial_number_match:
+                return serial_number_match.group(1)
+        except UnicodeDecodeError:
+            return None
+
+    serial = read_serial()
+    if serial:
+        return serial
+
+    cmd = "/sbin/udevadm info --query=property --name=sda"
+    output = os.popen(cmd).read()
+    serial_numbers = re.findall("ID_SERIAL=(.+)", output)
+    if serial_numbers:
+        return serial_numbers[0]
+    return None
+
+
+def read_serial() -> str | None:
+    """Get a storage serial number from the filesystem without a subprocess."""
+    # Match the 'ID_SERIAL' that udev reports for the first disk
+    with suppress(OSError):
+        for name in sorted(os.listdir(DISK_BY_ID)):
+            if name.startswith("ata-") and "-part" not in name:
+                target = os.path.realpath(os.path.join(DISK_BY_ID, name))
+                if os.path.basename(target) == "sda":
+                    return name.split("-", 1)[1]
+
+    # Without a udev link, fall back to the same disk's bare serial number
+    with suppress(OSError):
+        path = os.path.join(SYS_BLOCK, "sda", "device", "serial")
+        with open(path, encoding="utf-8") as file:
+            return file.read().strip() or None
+
+    return None
@@ -6,6 +6,7 @@ import log
 
 from .application import Application
 from .computer import Computer
+from .index import get_index
 
 
 @dataclass
@@ -29,10 +30,8 @@ class ProgramConfig:
     def find_computer(self, name: str):
         """Find the computer with the given name, else None."""
         log.debug("Finding computer for '%s'...", name)
-        for computer in self.computers:
-            if computer == name:
-                return computer
-        return None
+        index = get_index(self, "computers", lambda c: str(c).lower())
+        return index.find(self.computers, str(name).lower())
 
     def match_computer(self, partial: str):
         """Find a computer with a similar name."""
@@ -103,7 +102,5 @@ class ProgramConfig:
     def find_application(self, name: str):
         """Find the application with the given name, else None."""
         log.debug(f"Finding application for {name!r}...")
-        for application in self.applications:
-            if application == name:
-                return application
-        return None
+        index = get_index(self, "applications", lambda a: str(a).lower())
+        return index.find(self.applications, str(name).lower())
@@ -1,15 +1,24 @@
 """Data structures that combine all program data."""
 
+import os
+from contextlib import contextmanager
+from pathlib import Path
 
 import crayons
+import datafiles
 import log
-from datafiles import datafile, field
+from datafiles import datafile, field, formats
 
+from .. import profiler
 from ..manager import Manager
 from .computer import Computer
 from .config import ProgramConfig
+from .formats import register
+from .shards import CONVERTER, DIRECTORY, Shards
 from .status import ProgramStatus
 
+register()
+
 
 @datafile("{self.path}", defaults=True)
 class Data:
@@ -21,16 +30,142 @@ class Data:
 
     def __post_init__(self):
         self._last_counter = self.status.counter
+        self._shards: Shards | None = None
 
     def __repr__(self):
         return "settings"
 
+    @property
+    def shards(self) -> Shards | None:
+        """Get the status file for each computer, if that layout is used."""
+        return self._shards
+
     @property
     def modified(self):
+        if self._shards and self._shards.changed():
+            self._merge()
         changed = self.status.counter != self._last_counter
         self._last_counter = self.status.counter
         return changed
 
+    def use_shards(self, computer: Computer) -> bool:
+        """Write this computer's status to its own file if the layout is enabled.
+
+        The status section of the settings file is split into a file per
+        computer the first time, after which it is no longer written.
+
+        """
+        directory = os.path.join(os.path.dirname(self.path), DIRECTORY)
+        if not os.path.isdir(directory):
+            return False
+
+        log.info("Using status files in: %s", directory)
+        self._shards = Shards(directory, computer.name)
+        mapper = self.datafile
+        mapper.attrs = {k: v for k, v in mapper.attrs.items() if k != "status"}
+
+        existing = self._shards.load()
+        with datafiles.frozen():
+            names = {s.computer for a in self.status.applications for s in a.computers}
+            for name in sorted(names - set(existing)):
+                log.info("Moving status to its own file: %s", name)
+                self._shards.save(self.status.extract(name), name)
+        self._merge()
+        self._last_counter = self.status.counter
+        self.save()
+        return True
+
+    def reload(self):
+        """Read changes made by other computers since the last load."""
+        if self.datafile.modified:
+            self.datafile.load()
+        if self._shards and self._shards.changed():
+            self._merge()
+
+    @contextmanager
+    def transaction(self):
+        """Collect changes to the settings and write them once at the end."""
+        with datafiles.frozen():
+            yield self
+        self.save()
+
+    def save(self) -> bool:
+        """Atomically write the settings unless their contents are unchanged."""
+        with profiler.phase("save"):
+            mapper = self.datafile
+            with datafiles.frozen():
+                if not self._shards:
+                    # Other computers' files would keep their old timestamps
+                    self._last_counter -= self.status.rebase()
+                text = mapper.text
+
+            path = mapper.path
+            try:
+                unchanged = path.read_text() == text
+            except FileNotFoundError:
+                unchanged = False
+            if unchanged:
+                log.debug("Settings are unchanged: %s", path)
+            else:
+                log.debug("Writing settings: %s", path)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                # Sync services ignore files named like '~*.tmp'
+                temp = path.with_name(f"~{path.name}.{os.getpid()}.tmp")
+                temp.write_text(text)
+                os.replace(temp, path)
+
+            mapper.modified = False
+            if self._shards:
+                return self._save_shard() or not unchanged
+            return not unchanged
+
+    def _save_shard(self) -> bool:
+        assert self._shards
+        with datafiles.frozen():
+            shard = self.status.extract(self._shards.name)
+            if not self._shards.differs(shard):
+                return False
+            # Order this computer's queued launches after the others
+            if self.status.counter <= self._shards.latest:
+                offset = self._shards.latest + 1 - self.status.counter
+                self.status.counter += offset
+                self._last_counter += offset
+                shard.counter = self.status.counter
+        return self._shards.save(shard)
+
+    def _merge(self):
+        assert self._shards
+        with profiler.phase("shards"), datafiles.frozen():
+            self.status.merge(self._shards.load())
+            # Queued launches from others are not rewritten to this file
+            self._shards.track(self.status.extract(self._shards.name))
+
+    def reconcile(self, paths) -> int:
+        """Merge the status from conflicted copies of the settings file.
+
+        :return: number of copies that could be read and were merged
+
+        """
+        copies = []
+        for path in paths:
+            try:
+                content = formats.deserialize(Path(path), Path(path).suffix)
+                copy = CONVERTER.to_python_value(
+                    content.get("status") or {}, target_object=None
+                )
+            except Exception as e:  # pylint: disable=broad-except
+                log.warning("Unable to read conflicted copy %s: %s", path, e)
+                continue
+            log.info("Merging status from conflicted copy: %s", path)
+            copies.append(copy)
+
+        if copies and not self._shards:
+            with self.transaction():
+                merged = self.status.reconcile(*copies)
+                self.status.counter = merged.counter
+                self.status.applications[:] = merged.applications
+        return len(copies)
+
     def prune_status(self, *, reset_counter=False):
         """Remove undefined applications and computers."""
         log.info("Cleaning up applications and computers...")
@@ -61,6 +196,7 @@ class Data:
     def launch_queued_applications(self, computer: Computer, manager: Manager):
         """Launch applications that have been queued."""
         log.info("Launching queued applications...")
+        queued = []
         for status in self.status.applications:
             if status.next:
                 application = self.config.get_application(status.application)
@@ -72,7 +208,7 @@ class Data:
                         or not application.properties.single_instance
                     ):
                         if not manager.is_running(application):
-                            manager.start(application)
+                            queued.append(application)
                         status.next = None
                     else:
                         print(
@@ -83,13 +219,16 @@ class Data:
                 elif manager.is_running(application):
                     if not application.properties.keep_running:
                         manager.stop(application)
+        if queued:
+            manager.start_all(queued)
 
-    def close_all_applications(self, manager: Manager):
+    def close_all_applications(self, manager: Manager, timeout: float | None = None):
         """Close all applications running on this computer."""
         log.info("Closing all applications on this computer...")
-        for application in self.config.applications:
-            if not application.properties.keep_running:
-                manager.stop(application)
+        manager.stop_all(
+            [a for a in self.config.applications if not a.properties.keep_running],
+            timeout,
+        )
 
     def update_status(self, computer: Computer, manager: Manager):
         """Update each application's status."""
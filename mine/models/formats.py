@@ -0,0 +1,106 @@
+"""Fast serialization of the settings file."""
+
+import re
+
+import log
+from datafiles import formats
+
+try:
+    import yaml
+    from yaml import CSafeDumper, CSafeLoader
+except ImportError:  # pragma: no cover (optional)
+    yaml = None  # type: ignore
+
+# YAML 1.2 core schema, matching datafiles' default parser
+RESOLVERS = [
+    ("bool", r"^(?:true|True|TRUE|false|False|FALSE)$", "tTfF"),
+    ("null", r"^(?:~|null|Null|NULL|)$", ["~", "n", "N", ""]),
+    ("int", r"^[-+]?[0-9]+$", "-+0123456789"),
+    (
+        "float",
+        r"^(?:[-+]?(?:\.[0-9]+|[0-9]+(?:\.[0-9]*)?)(?:[eE][-+]?[0-9]+)?"
+        r"|[-+]?\.(?:inf|Inf|INF)|\.(?:nan|NaN|NAN))$",
+        "-+.0123456789",
+    ),
+]
+
+WIDTH = 2**31 - 1  # never wrap long names
+
+
+if yaml:
+
+    class Loader(CSafeLoader):  # pylint: disable=too-many-ancestors
+        """Parser for YAML 1.2 using libyaml."""
+
+        yaml_implicit_resolvers: dict = {}
+
+    class Dumper(CSafeDumper):  # pylint: disable=too-many-ancestors
+        """Emitter for YAML 1.2 using libyaml."""
+
+        yaml_implicit_resolvers: dict = {}
+
+        def represent_none(self, _data):
+            return self.represent_scalar("tag:yaml.org,2002:null", "")
+
+    for _cls in (Loader, Dumper):
+        for _name, _pattern, _first in RESOLVERS:
+            _cls.add_implicit_resolver(
+                "tag:yaml.org,2002:" + _name, re.compile(_pattern), list(_first)
+            )
+
+    Loader.add_constructor(
+        "tag:yaml.org,2002:int", lambda loader, node: int(loader.construct_scalar(node))
+    )
+    Dumper.add_representer(type(None), Dumper.represent_none)
+    Dumper.add_multi_representer(str, Dumper.represent_str)
+    Dumper.add_multi_representer(dict, Dumper.represent_dict)
+    Dumper.add_multi_representer(list, Dumper.represent_list)
+
+
+class YAML(formats.Formatter):
+    """Formatter for YAML using libyaml."""
+
+    @classmethod
+    def extensions(cls):
+        return {".yml", ".yaml"}
+
+    @classmethod
+    def deserialize(cls, file_object):
+        return yaml.load(file_object, Loader=Loader)
+
+    @classmethod
+    def serialize(cls, data):
+        if not data:
+            return ""
+        text = yaml.dump(
+            data, Dumper=Dumper, sort_keys=False, allow_unicode=True, width=WIDTH
+        )
+        return indent(text)
+
+
+def indent(text: str) -> str:
+    """Indent block sequences under their keys to match datafiles' layout."""
+    lines: list[str] = []
+    sequences: list[int] = []  # columns of the enclosing unindented sequences
+    for line in text.splitlines(keepends=True):
+        stripped = line.lstrip(" ")
+        column = len(line) - len(stripped)
+        item = stripped.startswith("- ") or stripped.rstrip() == "-"
+        while sequences and (
+            sequences[-1] > column or (sequences[-1] == column and not item)
+        ):
+            sequences.pop()
+        if item and lines and lines[-1].rstrip().endswith(":"):
+            if not sequences or sequences[-1] != column:
+                sequences.append(column)
+        lines.append("  " * len(sequences) + line)
+    return "".join(lines)
+
+
+def register():
+    """Use libyaml for settings files when it is available."""
+    if yaml and yaml.__with_libyaml__:
+        for extension in YAML.extensions():
+            formats.register(extension, YAML)
+    else:
+        log.debug("libyaml is unavailable, using the default YAML formatter")
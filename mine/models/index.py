@@ -0,0 +1,89 @@
+"""Lookup tables for lists of named items."""
+
+from collections.abc import Callable
+
+generation = 0  # incremented whenever an indexed item's key is reassigned
+
+
+def renamed():
+    """Record that an item's key changed, which invalidates every index."""
+    global generation  # pylint: disable=global-statement
+    generation += 1
+
+
+class Keyed:
+    """Mixin to invalidate indexes when an item's key attribute is reassigned."""
+
+    __slots__ = ()
+
+    KEY = ""
+
+    def __setattr__(self, name, value):
+        if name == self.KEY:
+            try:
+                previous = object.__getattribute__(self, name)
+            except AttributeError:
+                pass
+            else:
+                if previous != value:
+                    renamed()
+        super().__setattr__(name, value)
+
+
+class Index:
+    """Positions of items in a list by key, kept in sync as the list changes."""
+
+    def __init__(self, key: Callable):
+        self.key = key
+        self._items: list | None = None
+        self._snapshot: list = []
+        self._ids: list[int] = []
+        self._positions: dict = {}
+        self._generation = -1
+
+    def find(self, items: list, key):
+        """Get the first item with a matching key, else None."""
+        if (
+            items is not self._items
+            or self._generation != generation
+            or len(items) < len(self._ids)
+        ):
+            self._build(items)
+        elif len(items) > len(self._ids):
+            self._extend(items)
+
+        position = self._positions.get(key)
+        if position is not None and self.key(items[position]) == key:
+            return items[position]
+
+        # Items may have been replaced without changing the list's length
+        if list(map(id, items)) != self._ids:
+            self._build(items)
+            position = self._positions.get(key)
+            if position is not None:
+                return items[position]
+
+        return None
+
+    def _build(self, items: list):
+        self._items = items
+        self._snapshot = []
+        self._ids = []
+        self._positions = {}
+        self._generation = generation
+        self._extend(items)
+
+    def _extend(self, items: list):
+        for position in range(len(self._ids), len(items)):
+            item = items[position]
+            self._positions.setdefault(self.key(item), position)
+            self._snapshot.append(item)  # keep 'id' values from being reused
+            self._ids.append(id(item))
+
+
+def get_index(instance, name: str, key: Callable) -> Index:
+    """Get the index of an instance's list attribute, creating it if needed."""
+    indexes = instance.__dict__.setdefault("_indexes", {})
+    if name not in indexes:
+        indexes[name] = Index(key)
+    return indexes[name]
@@ -0,0 +1,109 @@
+"""Status files written separately by each computer."""
+
+import os
+from pathlib import Path
+
+import log
+from datafiles import formats
+from datafiles.converters import map_type
+
+from .status import ProgramStatus
+
+DIRECTORY = "status"  # create next to the settings file to enable shards
+EXTENSION = ".yml"
+
+CONVERTER = map_type(ProgramStatus)
+
+
+class Shards:
+    """Directory of status files named after the computer that writes each one."""
+
+    def __init__(self, directory: str, name: str):
+        self.directory = directory
+        self.name = name
+        self.latest = 0  # highest counter written by other computers
+        self._stats: dict[str, tuple[int, int]] = {}
+        self._content: dict | None = None  # this computer's status as last written
+
+    @property
+    def path(self) -> str:
+        """Get the file only this computer writes to."""
+        return self._get_path(self.name)
+
+    def changed(self) -> bool:
+        """Determine if any status file changed since the last load."""
+        return self._scan() != self._stats
+
+    def load(self) -> dict[str, ProgramStatus]:
+        """Read every computer's status file."""
+        self._stats = self._scan()
+        shards = {}
+        for filename in sorted(self._stats):
+            name = filename.removesuffix(EXTENSION)
+            try:
+                data = formats.deserialize(Path(self._get_path(name)), EXTENSION)
+                shard = CONVERTER.to_python_value(data, target_object=None)
+            except Exception as e:  # pylint: disable=broad-except
+                log.warning("Unable to read status file %s: %s", filename, e)
+                continue
+            shards[name] = shard
+            if name == self.name:
+                self._content = self._serialize(shard)[0]
+            else:
+                self.latest = max(self.latest, shard.counter)
+        return shards
+
+    def track(self, shard: ProgramStatus):
+        """Treat this computer's status as written, so only later changes are."""
+        self._content = self._serialize(shard)[0]
+
+    def differs(self, shard: ProgramStatus) -> bool:
+        """Determine if this computer's status changed other than its counter."""
+        return self._serialize(shard)[0] != self._content
+
+    def save(self, shard: ProgramStatus, name: str = "") -> bool:
+        """Atomically write a computer's status unless only its counter changed."""
+        name = name or self.name
+        content, text = self._serialize(shard)
+        if name == self.name:
+            if content == self._content:
+                return False
+            self._content = content
+
+        path = self._get_path(name)
+        log.debug("Writing status file: %s", path)
+        # Sync services ignore files named like '~*.tmp'
+        temp = os.path.join(self.directory, f"~{name}{EXTENSION}.{os.getpid()}.tmp")
+        with open(temp, "w", encoding="utf-8") as file:
+            file.write(text)
+        os.replace(temp, path)
+
+        # Only this write is known, so other changes are still detected
+        stat = os.stat(path)
+        self._stats[os.path.basename(path)] = (stat.st_mtime_ns, stat.st_size)
+        return True
+
+    def _get_path(self, name: str) -> str:
+        filename = name.replace(os.sep, "_") + EXTENSION
+        return os.path.join(self.directory, filename)
+
+    def _scan(self) -> dict[str, tuple[int, int]]:
+        stats = {}
+        try:
+            entries = list(os.scandir(self.directory))
+        except FileNotFoundError:
+            return stats
+        for entry in entries:
+            if entry.name.endswith(EXTENSION) and not entry.name.startswith("~"):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue  # the file was replaced while scanning
+                stats[entry.name] = (stat.st_mtime_ns, stat.st_size)
+        return stats
+
+    @staticmethod
+    def _serialize(shard: ProgramStatus) -> tuple[dict, str]:
+        data = CONVERTER.to_preserialization_data(shard)
+        content = {key: value for key, value in data.items() if key != "counter"}
+        return content, formats.serialize(data, EXTENSION)
@@ -6,7 +6,9 @@ from dataclasses import dataclass, field
 import log
 
 from .application import Application
+from .base import Model
 from .computer import Computer
+from .index import Keyed, get_index
 from .timestamp import Timestamp
 
 
@@ -47,8 +49,8 @@ def log_stopping(func):
     return wrapped
 
 
-@dataclass
-class State:
+@dataclass(slots=True)
+class State(Model):
     """Dictionary of computer state."""
 
     computer: str
@@ -61,10 +63,12 @@ class State:
         return str(self.computer).lower() < str(other.computer).lower()
 
 
-@dataclass
-class Status:
+@dataclass(slots=True)
+class Status(Keyed, Model):
     """Dictionary of computers using an application."""
 
+    KEY = "application"
+
     application: str
     computers: list[State] = field(default_factory=list)
     next: str | None = None
@@ -80,32 +84,61 @@ class Status:
 class ProgramStatus:
     """Dictionary of current program status."""
 
+    REBASE = 1_000  # smallest timestamp offset worth rewriting every state for
+
     counter: int = 0
     applications: list[Status] = field(default_factory=list)
 
+    def rebase(self, threshold: int = REBASE) -> int:
+        """Shift timestamps down so the oldest one becomes 1.
+
+        Zero still means never started or stopped, and every other timestamp
+        moves by the same amount, so activity and ordering are unchanged.
+
+        :param threshold: minimum offset, to avoid rewriting every state often
+        :return: amount subtracted from the counter and timestamps
+
+        """
+        timestamps = [
+            state.timestamp
+            for status in self.applications
+            for state in status.computers
+        ]
+        values = [v for t in timestamps for v in (t.started, t.stopped) if v]
+        offset = min(values, default=self.counter + 1) - 1
+        if offset <= threshold:
+            return 0
+
+        log.info("Rebasing status counter by %s", offset)
+        for timestamp in timestamps:
+            if timestamp.started:
+                timestamp.started -= offset
+            if timestamp.stopped:
+                timestamp.stopped -= offset
+        self.counter -= offset
+        return offset
+
     def find(self, application: Application):
         """Return the application status for an application."""
-        for status in self.applications:
-            if status.application == application.name:
-                break
-        else:
+        status = self._get_status(application)
+        if status is None:
             status = Status(application.name)
             self.applications.append(status)
         return status
 
     def get_latest(self, application: Application) -> str | None:
         """Get the last computer's name logged as running an application."""
-        for status in self.applications:
-            if status.application == application.name:
-                states = [s for s in status.computers if s.timestamp.active]
-                if states:
-                    states.sort(key=lambda s: s.timestamp, reverse=True)
-                    log.debug(
-                        "%s marked as started on: %s",
-                        application,
-                        ", ".join(str(s) for s in states),
-                    )
-                    return states[0].computer
+        status = self._get_status(application)
+        if status:
+            states = [s for s in status.computers if s.timestamp.active]
+            if states:
+                states.sort(key=lambda s: s.timestamp, reverse=True)
+                log.debug(
+                    "%s marked as started on: %s",
+                    application,
+                    ", ".join(str(s) for s in states),
+                )
+                return states[0].computer
 
         log.debug(f"{application} marked as started on: nothing")
         return None
@@ -113,11 +146,11 @@ class ProgramStatus:
     @log_running
     def is_running(self, application: Application, computer: Computer):
         """Determine if an application is logged as running on a computer."""
-        for status in self.applications:
-            if status.application == application.name:
-                for state in status.computers:
-                    if state.computer == computer.name:
-                        return state.timestamp.active
+        status = self._get_status(application)
+        if status:
+            for state in status.computers:
+                if state.computer == computer.name:
+                    return state.timestamp.active
 
         # Status not found, assume the application is not running
         return False
@@ -130,16 +163,13 @@ class ProgramStatus:
     @log_starting
     def start(self, application: Application, computer: Computer):
         """Record an application as running on a computer."""
-        for status in self.applications:
-            if status.application == application.name:
-                for state in status.computers:
-                    if state.computer == computer.name:
-                        self.counter += 1
-                        state.timestamp.started = self.counter
-                        return
-                break
-        else:
-            status = None  # type: ignore
+        status = self._get_status(application)
+        if status:
+            for state in status.computers:
+                if state.computer == computer.name:
+                    self.counter += 1
+                    state.timestamp.started = self.counter
+                    return
 
         # Status not found, add the application/computer as started
         self.counter += 1
@@ -155,16 +185,13 @@ class ProgramStatus:
     @log_stopping
     def stop(self, application: Application, computer: Computer):
         """Record an application as no longer running on a computer."""
-        for status in self.applications:
-            if status.application == application.name:
-                for state in status.computers:
-                    if state.computer == computer.name:
-                        self.counter += 1
-                        state.timestamp.stopped = self.counter
-                        return
-                break
-        else:
-            status = None  # type: ignore
+        status = self._get_status(application)
+        if status:
+            for state in status.computers:
+                if state.computer == computer.name:
+                    self.counter += 1
+                    state.timestamp.stopped = self.counter
+                    return
 
         # Status not found, add the application/computer as stopped
         self.counter += 1
@@ -176,3 +203,124 @@ class ProgramStatus:
             self.applications.append(status)
         else:
             status.computers.append(state)
+
+    def compact(self, age: int | None = None, window: int | None = None) -> int:
+        """Forget states that no longer affect which computer runs an application.
+
+        A missing state is treated the same as a stopped one, so removing
+        inactive states does not change any decisions.
+
+        :param age: status changes since an inactive state last changed
+        :param window: status changes since a computer's latest state changed,
+            after which all of its states are removed, including running ones
+
+        :return: number of states removed
+
+        """
+        idle = set()
+        if window is not None:
+            seen: dict[str, int] = {}
+            for status in self.applications:
+                for state in status.computers:
+                    latest = state.timestamp.latest
+                    seen[state.computer] = max(seen.get(state.computer, 0), latest)
+            for name, latest in sorted(seen.items()):
+                if self.counter - latest > window:
+                    log.info("Forgetting idle computer: %s", name)
+                    idle.add(name)
+
+        count = 0
+        for status in self.applications.copy():
+            for state in status.computers.copy():
+                if state.computer in idle or (
+                    age is not None
+                    and not state.timestamp.active
+                    and self.counter - state.timestamp.latest > age
+                ):
+                    status.computers.remove(state)
+                    count += 1
+            if not (status.computers or status.next):
+                self.applications.remove(status)
+                log.debug("Removed empty status: %s", status)
+
+        log.info("Removed %s inactive states", count)
+        return count
+
+    def extract(self, computer: str) -> "ProgramStatus":
+        """Get the states of one computer along with every queued launch."""
+        shard = ProgramStatus(self.counter)
+        for status in self.applications:
+            states = [state for state in status.computers if state.computer == computer]
+            if states or status.next:
+                shard.applications.append(
+                    Status(status.application, states, status.next)
+                )
+        return shard
+
+    def merge(self, shards: dict[str, "ProgramStatus"]):
+        """Combine the status written by each computer into this one.
+
+        Each computer's states are replaced by the ones in its own status.
+        Queued launches are taken from the status with the highest counter,
+        which was written after reading all the others.
+
+        """
+        latest = None
+        for name, shard in sorted(shards.items()):
+            for status in self.applications:
+                for state in status.computers.copy():
+                    if state.computer == name:
+                        status.computers.remove(state)
+            for other in shard.applications:
+                states = [s for s in other.computers if s.computer == name]
+                if states:
+                    self.find(Application(other.application)).computers.extend(states)
+            if latest is None or shard.counter >= latest.counter:
+                latest = shard
+            self.counter = max(self.counter, shard.counter)
+
+        if latest is not None:
+            queued = {s.application: s.next for s in latest.applications if s.next}
+            for status in self.applications:
+                status.next = queued.pop(status.application, None)
+            for name, computer in queued.items():
+                self.find(Application(name)).next = computer
+
+    def reconcile(self, *others: "ProgramStatus") -> "ProgramStatus":
+        """Combine conflicting copies of the status into a new one.
+
+        Each computer's state keeps the latest start and stop from any copy.
+        Queued launches come from the copy with the highest counter, where a
+        copy without one has already launched the application. The result is
+        the same for any order of the copies, including repeated ones.
+
+        """
+        copies = [self, *others]
+        names = sorted({s.application for c in copies for s in c.applications})
+        timestamps: dict[str, dict[str, Timestamp]] = {name: {} for name in names}
+        queued: dict[str, tuple[int, str]] = {}
+        for copy in copies:
+            for status in copy.applications:
+                for state in status.computers:
+                    timestamp = timestamps[status.application].setdefault(
+                        state.computer, Timestamp()
+                    )
+                    timestamp.started = max(timestamp.started, state.timestamp.started)
+                    timestamp.stopped = max(timestamp.stopped, state.timestamp.stopped)
+            nexts = {s.application: s.next for s in copy.applications if s.next}
+            for name in names:
+                candidate = (copy.counter, nexts.get(name, ""))
+                queued[name] = max(queued.get(name, candidate), candidate)
+
+        merged = ProgramStatus(max(copy.counter for copy in copies))
+        for name in names:
+            states = [
+                State(computer, timestamp)
+                for computer, timestamp in sorted(timestamps[name].items())
+            ]
+            merged.applications.append(Status(name, states, queued[name][1] or None))
+        return merged
+
+    def _get_status(self, application: Application) -> Status | None:
+        index = get_index(self, "applications", lambda s: s.application)
+        return index.find(self.applications, application.name)
@@ -2,9 +2,11 @@
 
 from dataclasses import dataclass
 
+from .base import Model
 
-@dataclass
-class Timestamp:
+
+@dataclass(slots=True)
+class Timestamp(Model):
     """Dictionary of last start and stop times."""
 
     started: int = 0
@@ -0,0 +1,78 @@
+"""Opt-in timing of each phase of the program's work."""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import log
+
+ENVIRONMENT_VARIABLE = "MINE_PROFILE"
+PATH = "/tmp/mine.profile.jsonl"  # next to the daemon's log
+
+cycle = 0
+
+_records: list[dict] = []
+_local = threading.local()  # phases being timed in each thread
+
+
+def enable():
+    """Turn on profiling for this process and any daemon it restarts."""
+    os.environ[ENVIRONMENT_VARIABLE] = "1"
+
+
+def enabled() -> bool:
+    """Determine if phases should be timed."""
+    return os.getenv(ENVIRONMENT_VARIABLE, "") not in ("", "0")
+
+
+@contextmanager
+def phase(name: str):
+    """Record the wall and CPU time spent in a block of code.
+
+    Nested phases are recorded separately and also counted in their parent.
+
+    """
+    if not enabled():
+        yield
+        return
+
+    if not hasattr(_local, "phases"):
+        _local.phases = []
+    phases = _local.phases
+    record = {
+        "time": round(time.time(), 3),
+        "pid": os.getpid(),
+        "cycle": cycle,
+        "phase": name,
+        "parent": phases[-1] if phases else None,
+    }
+    phases.append(name)
+    wall = time.perf_counter()
+    cpu = time.process_time()
+    try:
+        yield
+    finally:
+        record["wall"] = round(time.perf_counter() - wall, 6)
+        record["cpu"] = round(time.process_time() - cpu, 6)
+        phases.pop()
+        _records.append(record)
+
+
+def flush(path: str = PATH):
+    """Append the recorded phases as JSON lines and start a new cycle."""
+    global cycle  # pylint: disable=global-statement
+    cycle += 1
+
+    if not _records:
+        return
+    try:
+        with open(path, "a", encoding="utf-8") as file:
+            for record in _records:
+                file.write(json.dumps(record) + "\n")
+    except OSError as e:
+        log.warning("Unable to write profile: %s", e)
+    else:
+        log.debug("Recorded %s phase timing(s): %s", len(_records), path)
+    _records.clear()
@@ -2,18 +2,30 @@
 
 import os
 import re
+import time
+from collections.abc import Sequence
+from typing import TYPE_CHECKING
 
 import log
 
+from . import cache
 from .models.application import Application, Versions
 
+if TYPE_CHECKING:
+    from .models import Data
+
 ROOTS = (r"C:\Users", r"/Users", r"/home")
 SERVICES = ("Dropbox", "Dropbox (Personal)")
 CONFIG = "mine.yml"
 CONFLICT_BASE = r"{} \(.+'s conflicted copy \d+-\d+-\d+.*\).*"
 CONFLICT_ANY = CONFLICT_BASE.format(".+")
 CONFLICT_CONFIG = CONFLICT_BASE.format("mine")
+TEMPORARY = r"\.?~.*|.+\.(tmp|partial|download)"  # files still being synced
 DEPTH = 3  # number of levels to search for the settings file
+RACY_MTIME_NS = 2 * 10**9  # filesystem timestamp granularity to distrust
+QUIET = 1.0  # seconds without changes before the settings file is settled
+SETTLE = 10.0  # seconds to wait at most for the sharing service to settle
+SETTLE_INTERVAL = 0.2  # seconds between checks while settling
 APPLICATION = Application(
     "Dropbox",
     versions=Versions(mac="Dropbox.app", windows="Dropbox.exe", linux="dropbox"),
@@ -45,6 +57,12 @@ def find_config_path(top=None, root=None):
     top = top or os.path.expanduser("~")
     root = root or find_root(top=top)
 
+    paths = cache.load("config")
+    path = paths.get(root)
+    if path and os.path.isfile(path):
+        log.info("Found cached settings file: %s", path)
+        return path
+
     log.debug("Looking for '%s' in '%s'...", CONFIG, root)
     for dirpath, dirnames, _ in os.walk(root):
         depth = dirpath.count(os.path.sep) - root.count(os.path.sep)
@@ -54,31 +72,177 @@ def find_config_path(top=None, root=None):
         path = os.path.join(dirpath, CONFIG)
         if os.path.isfile(path) and not os.path.isfile(os.path.join(path, "setup.py")):
             log.info("Found settings file: %s", path)
+            paths[root] = path
+            cache.save("config", paths)
             return path
 
     raise EnvironmentError("No '{}' file found".format(CONFIG))
 
 
-def delete_conflicts(root=None, config_only=False, force=False) -> int:
+def settle(
+    path: str,
+    directories: Sequence = (),
+    quiet: float = QUIET,
+    timeout: float = SETTLE,
+) -> bool:
+    """Wait until the sharing service stops changing the settings file.
+
+    The file is settled once its size, modification time, and neighboring
+    temporary or conflicted files stay the same for the quiet period.
+
+    :param path: settings file being synced
+    :param directories: also wait for every file in these to settle
+    :param quiet: seconds without changes before returning
+    :param timeout: seconds to wait at most
+
+    :return: False if changes were still happening after the timeout
+
+    """
+    start = time.monotonic()
+    deadline = start + timeout
+    fingerprint = _get_fingerprint(path, directories)
+    unchanged = start
+    while True:
+        now = time.monotonic()
+        if now - unchanged >= quiet and _is_settled(fingerprint):
+            log.info("Settings settled after %.1f seconds", now - start)
+            return True
+        if now >= deadline:
+            log.info("Settings still changing after %.1f seconds", now - start)
+            return False
+
+        time.sleep(min(SETTLE_INTERVAL, deadline - now))
+        latest = _get_fingerprint(path, directories)
+        if latest != fingerprint:
+            fingerprint, unchanged = latest, time.monotonic()
+
+
+def delete_conflicts(root=None, config_only=False, force=False, path=None) -> int:
     """Delete all files with conflicted filenames."""
     root = root or find_root()
 
     log.info("%s conflicted files...", "Deleting" if force else "Displaying")
-    pattern = CONFLICT_CONFIG if config_only else CONFLICT_ANY
-    regex = re.compile(pattern)
+    if config_only:
+        path = path or find_config_path(root=root)
+        conflicts = _find_config_conflicts(os.path.dirname(os.path.abspath(path)))
+    else:
+        conflicts = _find_conflicts(root)
+
     count = 0
-    for dirname, _, filenames in os.walk(root):
-        for filename in filenames:
-            if regex.match(filename):
-                count += 1
-                path = os.path.join(dirname, filename)
-                if force:
-                    os.remove(path)
-                if not config_only:
-                    print(path)
+    for conflict in conflicts:
+        count += 1
+        if force:
+            os.remove(conflict)
+        if not config_only:
+            print(conflict)
 
     if count and not force:
         print(f"\nRun again with '--force' to delete these {count} conflict(s)")
         return 0
 
     return count
+
+
+def merge_conflicts(data: "Data") -> int:
+    """Merge conflicted copies of the settings file into it, then delete them."""
+    dirname = os.path.dirname(os.path.abspath(data.path))
+    conflicts = _find_config_conflicts(dirname)
+    if not conflicts:
+        return 0
+
+    data.reconcile(conflicts)
+    for conflict in conflicts:
+        log.info("Deleting conflicted copy: %s", conflict)
+        os.remove(conflict)
+    return len(conflicts)
+
+
+def _get_fingerprint(path: str, directories: Sequence) -> tuple:
+    """Get the state of the settings file and any files still being synced."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        current = None
+    else:
+        current = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+    regex = re.compile(f"{TEMPORARY}|{CONFLICT_CONFIG}")
+    pending = []
+    files = []
+    dirname = os.path.dirname(os.path.abspath(path))
+    for directory in [dirname, *directories]:
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if regex.fullmatch(entry.name):
+                        pending.append(entry.path)
+                    elif directory != dirname:
+                        try:
+                            stat = entry.stat()
+                        except FileNotFoundError:
+                            continue  # the file was replaced while scanning
+                        files.append((entry.name, stat.st_size, stat.st_mtime_ns))
+        except FileNotFoundError:
+            continue
+    return current, sorted(pending), sorted(files)
+
+
+def _is_settled(fingerprint: tuple) -> bool:
+    current, pending, _ = fingerprint
+    return current is not None and not pending
+
+
+def _find_config_conflicts(dirname: str) -> list[str]:
+    """Get conflicted copies of the settings file, which sit beside it."""
+    regex = re.compile(CONFLICT_CONFIG)
+    log.debug("Looking for conflicted settings in '%s'...", dirname)
+    with os.scandir(dirname) as entries:
+        return [e.path for e in entries if regex.match(e.name) and e.is_file()]
+
+
+def _find_conflicts(root: str) -> list[str]:
+    """Get all conflicted files, skipping directories unchanged since last time."""
+    root = os.fspath(root)
+    previous = cache.load("conflicts")
+    if previous.get("root") != root or previous.get("pattern") != CONFLICT_ANY:
+        previous = {}
+    cached = previous.get("directories", {})
+    directories = {}
+    regex = re.compile(CONFLICT_ANY)
+    paths = []
+
+    # Directories modified this recently may change again without a new mtime
+    racy = time.time_ns() - RACY_MTIME_NS
+
+    log.debug("Looking for conflicted files in '%s'...", root)
+    pending = [root]
+    while pending:
+        dirname = pending.pop()
+        try:
+            mtime = os.stat(dirname).st_mtime_ns
+        except OSError:
+            continue
+
+        if dirname in cached and cached[dirname][0] == mtime:
+            _, subdirnames, filenames = cached[dirname]
+        else:
+            subdirnames, filenames = [], []
+            try:
+                with os.scandir(dirname) as entries:
+                    for entry in entries:
+                        if entry.is_dir():
+                            if not entry.is_symlink():
+                                subdirnames.append(entry.name)
+                        elif regex.match(entry.name):
+                            filenames.append(entry.name)
+            except OSError:
+                continue
+
+        directories[dirname] = [mtime if mtime < racy else 0, subdirnames, filenames]
+        paths.extend(os.path.join(dirname, name) for name in filenames)
+        pending.extend(os.path.join(dirname, name) for name in subdirnames)
+
+    cache.save(
+        "conflicts", {"root": root, "pattern": CONFLICT_ANY, "directories": directories}
+    )
+    return sorted(paths)
@@ -6,6 +6,8 @@ import platform
 import log
 import pytest
 
+from mine import cache, control
+
 ENV = "TEST_INTEGRATION"  # environment variable to enable integration tests
 REASON = "'{0}' variable not set".format(ENV)
 
@@ -24,6 +26,22 @@ def pytest_configure(config):
     terminal.TerminalReporter.showfspath = False
 
 
+@pytest.fixture(autouse=True)
+def cache_directory(tmp_path_factory, monkeypatch):
+    """Keep cached values from leaking between tests."""
+    directory = tmp_path_factory.mktemp("cache")
+    monkeypatch.setattr(cache, "DIRECTORY", str(directory))
+    return directory
+
+
+@pytest.fixture(autouse=True)
+def control_socket(tmp_path_factory, monkeypatch):
+    """Keep tests from sending commands to a running daemon."""
+    path = tmp_path_factory.mktemp("control") / "mine.sock"
+    monkeypatch.setattr(control, "PATH", str(path))
+    return path
+
+
 def pytest_runtest_setup(item):
     if "linux_only" in item.keywords and platform.system() != "Linux":
         pytest.skip("Test can only be run on Linux")
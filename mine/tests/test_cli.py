@@ -2,6 +2,8 @@
 
 import logging
 import os
+import subprocess
+import sys
 from unittest.mock import Mock, patch
 
 import pytest
@@ -55,6 +57,22 @@ class TestMain:
 
         assert os.path.isfile(tmp_path)
 
+    @patch("mine.daemon.application", None)
+    @patch("mine.watcher.Watcher")
+    def test_path_without_watching(self, mock_watcher, tmp_path):
+        """Verify the settings file is only watched when repeating."""
+        cli.main(["--file", tmp_path])
+
+        assert not mock_watcher.called
+
+    @patch("mine.cli.run")
+    def test_profile(self, mock_run, monkeypatch):
+        """Verify profiling is enabled for the program and its daemon."""
+        monkeypatch.setenv("MINE_PROFILE", "")
+        cli.main(["--profile"])
+        mock_run.assert_called_once_with(path=None, delay=None)
+        assert "1" == os.environ["MINE_PROFILE"]
+
     @patch("mine.cli.run")
     def test_daemon(self, mock_run):
         cli.main(["--daemon"])
@@ -65,12 +83,55 @@ class TestMain:
         cli.main(["--daemon", "42"])
         mock_run.assert_called_once_with(path=None, delay=42)
 
+    @patch("mine.cli.run")
+    def test_daemon_with_automatic_delay(self, mock_run):
+        cli.main(["--daemon", "auto"])
+        mock_run.assert_called_once_with(path=None, delay="auto")
+
+    def test_daemon_with_invalid_delay(self):
+        with pytest.raises(SystemExit):
+            cli.main(["--daemon", "soon"])
+
     @patch("mine.daemon.application", Application("?"))
     def test_warning_when_daemon_is_not_running(self, tmp_path):
         with pytest.raises(SystemExit):
             cli.main(["--file", tmp_path])
 
 
+class TestImports:
+    """Integration tests for the command-line startup time."""
+
+    BUDGET = 0.15  # seconds to import the CLI, measured at ~0.05
+    DEFERRED = ["crayons", "datafiles", "psutil", "startfile", "mine.models"]
+
+    @staticmethod
+    def import_times():
+        output = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "import mine.cli"],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stderr
+        times = {}
+        for line in output.splitlines()[1:]:
+            _, cumulative, name = line.split("|")
+            times[name.strip()] = int(cumulative) / 1e6
+        return times
+
+    def test_heavy_modules_are_deferred(self):
+        """Verify parsing arguments does not import the program's dependencies."""
+        times = self.import_times()
+        for name in self.DEFERRED:
+            assert name not in times
+
+    def test_import_time_budget(self):
+        """Verify the CLI can be imported quickly."""
+        times = min(
+            (self.import_times() for _ in range(3)), key=lambda t: t["mine.cli"]
+        )
+        assert times["mine.cli"] < self.BUDGET
+
+
 class TestSwitch:
     """Unit tests for the `switch` function."""
 
@@ -86,27 +147,85 @@ class TestSwitch:
         cli.main(["switch", "foobar"])
         mock_run.assert_called_once_with(path=None, delay=None, switch="foobar")
 
+    @patch("mine.control.send", Mock(return_value={"ok": True, "computer": "abc"}))
+    @patch("mine.cli.run")
+    def test_switch_with_daemon(self, mock_run):
+        """Verify a running daemon can perform the switch."""
+        cli.main(["switch", "abc"])
+        assert not mock_run.called
+
+    @patch("mine.control.send")
+    @patch("mine.cli.run")
+    def test_close_with_daemon(self, mock_run, mock_send):
+        """Verify a running daemon can close applications."""
+        mock_send.return_value = {"ok": True, "computer": None}
+        cli.main(["close"])
+        mock_send.assert_called_once_with(
+            {"command": "switch", "switch": False, "path": None}
+        )
+        assert not mock_run.called
+
+    @patch("mine.control.send", Mock(return_value={"ok": False, "error": "?"}))
+    @patch("mine.cli.run")
+    def test_switch_when_daemon_fails(self, mock_run):
+        """Verify the switch is performed directly if the daemon fails."""
+        cli.main(["switch"])
+        mock_run.assert_called_once_with(path=None, delay=None, switch=True)
+
 
 class TestClean:
     @patch("mine.cli.run")
     def test_clean(self, mock_run):
         cli.main(["clean"])
         mock_run.assert_called_once_with(
-            path=None, delay=None, delete=True, force=False, reset=False, stop=False
+            path=None,
+            delay=None,
+            delete=True,
+            force=False,
+            reset=False,
+            compact=None,
+            forget=None,
+            stop=False,
         )
 
     @patch("mine.cli.run")
     def test_clean_with_force(self, mock_run):
         cli.main(["clean", "--force"])
         mock_run.assert_called_once_with(
-            path=None, delay=None, delete=True, force=True, reset=False, stop=False
+            path=None,
+            delay=None,
+            delete=True,
+            force=True,
+            reset=False,
+            compact=None,
+            forget=None,
+            stop=False,
         )
 
+    @patch("mine.cli.run")
+    def test_clean_with_compact(self, mock_run):
+        cli.main(["clean", "--compact"])
+        assert cli.COMPACT == mock_run.call_args.kwargs["compact"]
+        assert None is mock_run.call_args.kwargs["forget"]
+
+    @patch("mine.cli.run")
+    def test_clean_with_compact_and_forget(self, mock_run):
+        cli.main(["clean", "--compact", "10", "--forget", "50"])
+        assert 10 == mock_run.call_args.kwargs["compact"]
+        assert 50 == mock_run.call_args.kwargs["forget"]
+
     @patch("mine.cli.run")
     def test_clean_with_stop(self, mock_run):
         cli.main(["clean", "--stop"])
         mock_run.assert_called_once_with(
-            path=None, delay=None, delete=True, force=False, reset=False, stop=True
+            path=None,
+            delay=None,
+            delete=True,
+            force=False,
+            reset=False,
+            compact=None,
+            forget=None,
+            stop=True,
         )
 
 
@@ -0,0 +1,80 @@
+# pylint: disable=unused-variable,redefined-outer-name
+
+import threading
+
+import pytest
+
+from mine import control
+
+
+@pytest.fixture
+def server(control_socket):
+    with control.Server(str(control_socket)) as server:
+        yield server
+
+
+def serve(server, callback, count=1):
+    def run():
+        handled = 0
+        while handled < count:
+            handled += server.handle(callback)
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread
+
+
+def describe_send():
+    def it_returns_none_without_a_daemon(control_socket):
+        assert None is control.send({"command": "switch"}, str(control_socket))
+
+    def it_returns_the_reply(server):
+        thread = serve(server, lambda request: {"ok": True, **request})
+
+        reply = control.send({"command": "switch", "switch": "abc"}, server.path)
+
+        thread.join()
+        assert {"ok": True, "command": "switch", "switch": "abc"} == reply
+
+    def it_reports_errors_from_the_daemon(server):
+        def fail(_request):
+            raise ValueError("boom")
+
+        thread = serve(server, fail)
+
+        reply = control.send({"command": "switch"}, server.path)
+
+        thread.join()
+        assert {"ok": False, "error": "boom"} == reply
+
+
+def describe_server():
+    def it_listens_on_a_private_socket(server, control_socket):
+        assert server.listening
+        assert 0o600 == control_socket.stat().st_mode & 0o777
+
+    def it_replaces_stale_sockets(control_socket):
+        with control.Server(str(control_socket)):
+            pass
+        control_socket.write_text("")
+
+        with control.Server(str(control_socket)) as server:
+            assert server.listening
+
+    def it_does_not_replace_a_listening_daemon(server):
+        thread = serve(server, lambda request: {"ok": True})
+
+        with control.Server(server.path) as other:
+            assert not other.listening
+
+        thread.join()
+        assert server.listening
+
+    def it_removes_the_socket_when_closed(server, control_socket):
+        server.close()
+
+        assert not control_socket.exists()
+        assert not server.listening
+
+    def it_handles_nothing_without_requests(server):
+        assert 0 == server.handle(lambda request: {"ok": True})
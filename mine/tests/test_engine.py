@@ -0,0 +1,162 @@
+# pylint: disable=unused-variable,redefined-outer-name
+
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from mine import control
+from mine.engine import Engine, Schedule
+
+
+@pytest.fixture
+def data():
+    data = MagicMock()
+    data.modified = False
+    return data
+
+
+@pytest.fixture
+def watcher():
+    watcher = MagicMock(polling=True, interval=0.05)
+    watcher.check.return_value = False
+    return watcher
+
+
+@pytest.fixture(autouse=True)
+def merge_conflicts():
+    with patch("mine.services.merge_conflicts", return_value=0) as mock:
+        yield mock
+
+
+@pytest.fixture(autouse=True)
+def settle():
+    with patch("mine.services.settle", return_value=True) as mock:
+        yield mock
+
+
+def describe_run():
+    def it_launches_applications_at_startup(data, watcher, merge_conflicts):
+        manager = MagicMock()
+
+        Engine(data, manager, "this", 60, watcher).run(duration=0.2)
+
+        merge_conflicts.assert_called_once()
+        data.launch_queued_applications.assert_called_once_with("this", manager)
+        data.update_status.assert_called_once_with("this", manager)
+        manager.watch.assert_called_once_with()
+        assert None is manager.executor
+
+    def it_runs_blocking_calls_in_threads(data, watcher):
+        threads = []
+        data.launch_queued_applications.side_effect = lambda *_: threads.append(
+            threading.current_thread()
+        )
+
+        Engine(data, MagicMock(), "this", 60, watcher).run(duration=0.2)
+
+        assert [threading.current_thread()] != threads
+        assert threads[0].name.startswith("mine")
+
+    def it_launches_applications_after_changes(data, watcher, settle):
+        watcher.directories = ["status"]
+        checks = iter([False, False, True])
+        watcher.check.side_effect = lambda: next(checks, False)
+        data.modified = True
+
+        Engine(data, MagicMock(), "this", 60, watcher).run(duration=0.5)
+
+        settle.assert_called_once_with(watcher.path, ["status"])
+        assert 2 == data.launch_queued_applications.call_count
+
+    def it_ignores_its_own_changes(data, watcher, settle):
+        watcher.check.return_value = True
+
+        Engine(data, MagicMock(), "this", 60, watcher).run(duration=0.5)
+
+        settle.assert_not_called()
+        assert 1 == data.launch_queued_applications.call_count
+
+    def it_sweeps_conflicts_periodically(data, watcher, merge_conflicts):
+        Engine(data, MagicMock(), "this", 0.1, watcher).run(duration=0.35)
+
+        assert 3 <= merge_conflicts.call_count
+        assert 3 <= data.launch_queued_applications.call_count
+
+    def it_waits_for_merged_conflicts_to_settle(data, watcher, merge_conflicts, settle):
+        merge_conflicts.return_value = 2
+
+        Engine(data, MagicMock(), "this", 60, watcher).run(duration=0.2)
+
+        settle.assert_called_once()
+        data.launch_queued_applications.assert_called_once()
+
+    def it_checks_sooner_after_changes(data, watcher, merge_conflicts, monkeypatch):
+        monkeypatch.setattr(Schedule, "MINIMUM", 0.1)
+        checks = iter([False, True])
+        watcher.check.side_effect = lambda: next(checks, False)
+        data.modified = True
+        engine = Engine(data, MagicMock(), "this", None, watcher)
+        engine.schedule.interval = 60
+
+        engine.run(duration=0.5)
+
+        assert 2 <= merge_conflicts.call_count
+
+    def it_stops_on_errors(data, watcher):
+        data.launch_queued_applications.side_effect = ValueError("boom")
+
+        with pytest.raises(ValueError, match="boom"):
+            Engine(data, MagicMock(), "this", 60, watcher).run()
+
+    def it_handles_requests_while_applications_stop(data, watcher, control_socket):
+        manager = MagicMock()
+        replies = []
+
+        def handle(request):
+            if request["switch"] == "other":
+                manager.executor.submit(time.sleep, 1)  # a slow stop
+            return {"ok": True, "computer": request["switch"]}
+
+        def switch():
+            start = time.monotonic()
+            for name in ["other", "this"]:
+                request = {"command": "switch", "switch": name}
+                replies.append(control.send(request, str(control_socket)))
+            replies.append(time.monotonic() - start)
+
+        with control.Server(str(control_socket)) as server:
+            thread = threading.Thread(target=switch)
+            thread.start()
+            Engine(data, manager, "this", 60, watcher, server, handle).run(duration=0.5)
+            thread.join()
+
+        assert {"ok": True, "computer": "other"} == replies[0]
+        assert {"ok": True, "computer": "this"} == replies[1]
+        assert replies[2] < 0.5
+
+
+def describe_schedule():
+    def it_uses_a_fixed_delay():
+        schedule = Schedule(42)
+        schedule.changed()
+
+        assert [42.0] * 20 == [schedule.next() for _ in range(20)]
+
+    def it_backs_off_when_idle():
+        schedule = Schedule()
+
+        intervals = [schedule.next() for _ in range(12)]
+
+        assert [15.0] * 4 + [30.0, 60.0, 120.0, 240.0, 480.0] + [900.0] * 3 == intervals
+
+    def it_stays_fast_for_a_burst_after_changes():
+        schedule = Schedule()
+        for _ in range(20):
+            schedule.next()
+
+        schedule.changed()
+
+        intervals = [schedule.next() for _ in range(14)]
+        assert [15.0] * 12 + [30.0, 60.0] == intervals
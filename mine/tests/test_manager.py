@@ -1,6 +1,23 @@
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, Mock, patch
+
+import psutil
 import pytest
 
-from mine.manager import LinuxManager, MacManager, WindowsManager, get_manager
+from mine.manager import (
+    LinuxManager,
+    MacManager,
+    ProcessEvents,
+    ProcessSnapshot,
+    WindowsManager,
+    get_manager,
+    terminate,
+)
 from mine.models import Application
 
 
@@ -96,3 +113,392 @@ class TestWindowsManager:
         """Verify a process can be detected as untracked."""
         application = Application("Fake Application")
         assert None is self.manager.is_running(application)
+
+
+def _process(pid, *cmdline, status=psutil.STATUS_RUNNING, created=1.0, parent=0):
+    process = MagicMock(pid=pid)
+    process.ppid.return_value = parent
+    process.status.return_value = status
+    process.name.return_value = os.path.basename(cmdline[0])
+    process.create_time.return_value = created
+    process.cmdline.return_value = list(cmdline)
+    return process
+
+
+class TestProcessSnapshot:
+    """Unit tests for the running process index."""
+
+    processes = [
+        _process(1, "/sbin/init"),
+        _process(2, "/Applications/Slack.app/Contents/MacOS/Slack"),
+        _process(3, "/Applications/Slack.app/Slack Helper.app/Helper"),
+        _process(4, "/usr/bin/yes", status=psutil.STATUS_ZOMBIE),
+    ]
+
+    @patch("psutil.process_iter", Mock(return_value=processes))
+    def test_find(self):
+        """Verify processes are found by any part of their command line."""
+        snapshot = ProcessSnapshot()
+        assert 3 == snapshot.count
+        assert [self.processes[1], self.processes[2]] == snapshot.find("slack.app")
+        assert [self.processes[0]] == snapshot.find("INIT")
+        assert [] == snapshot.find("yes")
+
+    @patch("psutil.process_iter", Mock(return_value=processes))
+    def test_find_ignored(self):
+        """Verify processes can be skipped by name."""
+        snapshot = ProcessSnapshot()
+        processes = snapshot.find("Slack.app", ignored=["Slack Helper.app"])
+        assert [self.processes[1]] == processes
+
+    def test_cached_command_lines(self):
+        """Verify command lines are only read for new processes."""
+        processes = [_process(1, "/sbin/init"), _process(2, "/usr/bin/slack")]
+        cache: dict = {}
+        with patch("psutil.process_iter", Mock(return_value=processes)):
+            ProcessSnapshot(cache)
+            ProcessSnapshot(cache)
+            snapshot = ProcessSnapshot(cache)
+
+        assert [processes[1]] == snapshot.find("slack")
+        assert 1 == processes[1].cmdline.call_count
+        assert 2 == len(cache)
+
+    def test_cached_command_lines_for_reused_pids(self):
+        """Verify command lines are read again when a pid is reused."""
+        cache: dict = {}
+        with patch("psutil.process_iter", Mock(return_value=[_process(5, "a")])):
+            ProcessSnapshot(cache)
+        with patch("psutil.process_iter", Mock(return_value=[_process(5, "a", "b")])):
+            assert [] == ProcessSnapshot(cache).find("b")
+        process = _process(5, "a", "b", created=2.0)
+        with patch("psutil.process_iter", Mock(return_value=[process])):
+            assert [process] == ProcessSnapshot(cache).find("b")
+
+    @patch("psutil.process_iter")
+    def test_reused_until_invalidated(self, mock_process_iter):
+        """Verify a manager scans processes once until invalidated."""
+        mock_process_iter.return_value = self.processes
+        manager = get_manager("Linux")
+        application = Application("init")
+        application.versions.linux = "init"
+
+        assert manager.is_running(application)
+        assert manager.is_running(application)
+        assert 1 == mock_process_iter.call_count
+
+        manager.invalidate()
+        assert manager.is_running(application)
+        assert 2 == mock_process_iter.call_count
+
+    @patch("psutil.process_iter")
+    def test_stop_without_matches_keeps_snapshot(self, mock_process_iter):
+        """Verify stopping applications that are not running does not rescan."""
+        mock_process_iter.return_value = self.processes
+        manager = get_manager("Linux")
+
+        for index in range(3):
+            application = Application(f"app{index}")
+            application.versions.linux = f"app{index}"
+            manager.stop(application)
+
+        assert 1 == mock_process_iter.call_count
+
+    @patch("psutil.process_iter", Mock(return_value=processes[:2]))
+    def test_update(self):
+        """Verify processes can be added and removed without a scan."""
+        snapshot = ProcessSnapshot()
+        started = _process(5, "/usr/bin/dropbox")
+
+        parts = snapshot.update(started=[started, self.processes[1]], stopped=[1])
+
+        assert {"", "usr", "bin", "dropbox", "sbin", "init"} == parts
+        assert [] == snapshot.find("init")
+        assert [started] == snapshot.find("dropbox")
+        assert 2 == snapshot.count
+
+    def test_tree(self):
+        """Verify descendants are collected from a single scan."""
+        processes = [
+            _process(1, "/sbin/init"),
+            _process(2, "/usr/bin/slack", parent=1),
+            _process(3, "/usr/lib/chromium/renderer", parent=2),
+            _process(4, "/usr/lib/chromium/gpu", parent=3),
+            _process(5, "/usr/bin/slack", "--type=utility", parent=2),
+            _process(6, "/usr/bin/yes", parent=1),
+        ]
+        with patch("psutil.process_iter", Mock(return_value=processes)):
+            snapshot = ProcessSnapshot()
+
+        tree = snapshot.tree(snapshot.find("slack"))
+
+        assert [processes[i] for i in (1, 4, 2, 3)] == tree
+        for process in processes:
+            process.children.assert_not_called()
+
+    @patch("psutil.process_iter", Mock(return_value=processes[:2]))
+    def test_tree_after_update(self):
+        """Verify descendants are tracked as processes start and stop."""
+        snapshot = ProcessSnapshot()
+        parent = self.processes[1]
+        child = _process(5, "/usr/lib/slack/helper", parent=2)
+        grandchild = _process(6, "/usr/lib/slack/renderer", parent=5)
+
+        snapshot.update(started=[child, grandchild])
+        assert [parent, child, grandchild] == snapshot.tree([parent])
+
+        snapshot.update(stopped=[5])
+        assert [parent] == snapshot.tree([parent])
+
+        snapshot.update(stopped=[6])
+        assert [parent] == snapshot.tree([parent])
+
+
+class FakeEvents:
+    """Process event source with preset changes."""
+
+    def __init__(self):
+        self.started: list = []
+        self.stopped: set = set()
+
+    def poll(self):
+        started, stopped = self.started, self.stopped
+        self.started, self.stopped = [], set()
+        return started, stopped
+
+
+class TestProcessEvents:
+    """Unit tests for detecting process changes."""
+
+    @patch("psutil.Process", lambda pid: _process(pid, f"/bin/{pid}"))
+    def test_poll(self):
+        """Verify started and stopped processes are detected by ID."""
+        with patch("psutil.pids", Mock(return_value=[1, 2, 3])):
+            events = ProcessEvents()
+        with patch("psutil.pids", Mock(return_value=[1, 3, 4])):
+            started, stopped = events.poll()
+
+        assert [4] == [process.pid for process in started]
+        assert {2} == stopped
+
+    def test_poll_exited(self):
+        """Verify processes that exit before they are read are ignored."""
+        with patch("psutil.pids", Mock(return_value=[1])):
+            events = ProcessEvents()
+        with patch("psutil.pids", Mock(return_value=[1, 2])), patch(
+            "psutil.Process", Mock(side_effect=psutil.NoSuchProcess(2))
+        ):
+            assert ([], set()) == events.poll()
+
+
+class TestRefresh:
+    """Unit tests for applying process events to a manager."""
+
+    def setup_method(self, _):
+        self.events = FakeEvents()
+        self.manager = get_manager("Linux")
+        self.manager.watch(self.events)
+        self.application = Application("Slack")
+        self.application.versions.linux = "slack"
+
+    @patch("psutil.process_iter", Mock(return_value=[_process(1, "/sbin/init")]))
+    def test_refresh_started(self):
+        """Verify a started application is detected without a scan."""
+        assert not self.manager.is_running(self.application)
+        self.events.started = [_process(2, "/usr/bin/slack")]
+
+        assert self.manager.refresh([self.application])
+        assert self.manager.is_running(self.application)
+
+    @patch("psutil.process_iter", Mock(return_value=[_process(2, "/usr/bin/slack")]))
+    def test_refresh_stopped(self):
+        """Verify a stopped application is detected without a scan."""
+        assert self.manager.is_running(self.application)
+        self.events.stopped = {2}
+
+        assert self.manager.refresh([self.application])
+        assert not self.manager.is_running(self.application)
+
+    @patch("psutil.process_iter", Mock(return_value=[_process(1, "/sbin/init")]))
+    def test_refresh_unrelated(self):
+        """Verify changes to untracked processes are ignored."""
+        assert not self.manager.is_running(self.application)
+        self.events.started = [_process(3, "/usr/bin/yes")]
+
+        assert not self.manager.refresh([self.application])
+
+    def test_refresh_without_snapshot(self):
+        """Verify events are discarded until processes are scanned."""
+        self.events.stopped = {2}
+
+        assert not self.manager.refresh([self.application])
+
+
+class TestStopAll:
+    """Unit tests for stopping many applications at once."""
+
+    processes = [
+        _process(1, "/usr/bin/slack"),
+        _process(2, "/usr/lib/slack/helper", "--type=slack"),
+        _process(3, "/usr/bin/spotify"),
+    ]
+
+    def setup_method(self, _):
+        self.manager = get_manager("Linux")
+        self.applications = []
+        for name in ["slack", "spotify", "dropbox"]:
+            application = Application(name)
+            application.versions.linux = name
+            self.applications.append(application)
+
+    @patch("psutil.process_iter", Mock(return_value=processes))
+    @patch("psutil.wait_procs")
+    def test_stop_all(self, mock_wait_procs):
+        """Verify every process is terminated before waiting on any of them."""
+        mock_wait_procs.return_value = (self.processes, [])
+
+        self.manager.stop_all(self.applications, timeout=1.5)
+
+        for process in self.processes:
+            process.terminate.assert_called_once_with()
+            process.kill.assert_not_called()
+        mock_wait_procs.assert_called_once_with(self.processes, timeout=1.5)
+
+    @patch("psutil.wait_procs")
+    def test_stop_all_includes_children(self, mock_wait_procs):
+        """Verify helper processes are terminated with the matching ones."""
+        processes = [
+            _process(1, "/usr/bin/slack"),
+            _process(2, "/usr/lib/chromium/renderer", parent=1),
+            _process(3, "/usr/bin/slack", "--type=gpu", parent=1),
+            _process(4, "/usr/lib/chromium/renderer", parent=3),
+            _process(5, "/usr/lib/chromium/renderer"),
+        ]
+        mock_wait_procs.return_value = (processes[:4], [])
+
+        with patch("psutil.process_iter", Mock(return_value=processes)) as scan:
+            self.manager.stop_all(self.applications[:1])
+
+        group = [processes[i] for i in (0, 2, 1, 3)]
+        mock_wait_procs.assert_called_once_with(group, timeout=5.0)
+        for process in group:
+            process.terminate.assert_called_once_with()
+        processes[4].terminate.assert_not_called()
+        assert 1 == scan.call_count
+
+    @patch("psutil.process_iter", Mock(return_value=processes))
+    @patch("psutil.wait_procs")
+    def test_stop_all_kills_unresponsive(self, mock_wait_procs):
+        """Verify processes still running after the timeout are killed."""
+        slow = self.processes[2]
+        mock_wait_procs.side_effect = [(self.processes[:2], [slow]), ([slow], [])]
+
+        self.manager.stop_all(self.applications[1:])
+
+        slow.kill.assert_called_once_with()
+        assert mock_wait_procs.call_count == 2
+
+    @patch("psutil.process_iter", Mock(return_value=processes))
+    @patch("psutil.wait_procs")
+    def test_stop_all_without_matches(self, mock_wait_procs):
+        """Verify nothing is waited on when no applications are running."""
+        self.manager.stop_all(self.applications[2:])
+
+        mock_wait_procs.assert_not_called()
+
+    @patch("psutil.process_iter", Mock(return_value=processes))
+    def test_stop_all_in_background(self):
+        """Verify processes count as stopped while they exit in the background."""
+        exiting = threading.Event()
+        self.manager.executor = ThreadPoolExecutor(1)
+
+        with patch("mine.manager.terminate", lambda *_: exiting.wait(1)):
+            self.manager.stop_all(self.applications[:1])
+            assert False is self.manager.is_running(self.applications[0])
+            assert True is self.manager.is_running(self.applications[1])
+
+            exiting.set()
+            self.manager.executor.shutdown()
+
+        assert True is self.manager.is_running(self.applications[0])
+
+
+class TestStartAll:
+    """Unit tests for starting many applications at once."""
+
+    def setup_method(self, _):
+        self.processes: list = []
+        self.manager = get_manager("Linux")
+        self.manager.LAUNCH_INTERVAL = 0.01
+        self.applications = []
+        for name in ["slack", "spotify", "dropbox", "signal"]:
+            application = Application(name)
+            application.versions.linux = name
+            self.applications.append(application)
+
+    def launch(self, application):
+        time.sleep(0.2)
+        process = _process(len(self.processes) + 1, application.versions.linux)
+        self.processes.append(process)
+        return process
+
+    def test_start_all(self):
+        """Verify applications are started together until they are running."""
+        with patch.object(self.manager, "_launch", self.launch), patch(
+            "psutil.process_iter", lambda: list(self.processes)
+        ):
+            start = time.monotonic()
+            ready = self.manager.start_all(self.applications)
+            elapsed = time.monotonic() - start
+
+        assert self.applications == ready
+        assert elapsed < 0.6
+
+    @patch("psutil.process_iter", Mock(return_value=[]))
+    def test_start_all_timeout(self):
+        """Verify applications that never appear are given up on."""
+        with patch.object(self.manager, "_launch", Mock(return_value=Mock())):
+            start = time.monotonic()
+            ready = self.manager.start_all(self.applications[:1], timeout=0.1)
+
+        assert [] == ready
+        assert time.monotonic() - start >= 0.1
+
+    @patch("psutil.process_iter")
+    def test_start_all_not_launched(self, mock_process_iter):
+        """Verify nothing is waited on when applications cannot be launched."""
+        with patch.object(self.manager, "_launch", Mock(return_value=None)):
+            assert [] == self.manager.start_all(self.applications)
+
+        mock_process_iter.assert_not_called()
+
+    def test_launch_missing_command(self):
+        """Verify a missing command is reported instead of raised."""
+        application = Application("Fake Application")
+        application.versions.linux = "mine-fake-application"
+
+        assert None is self.manager._launch(application)
+
+
+@pytest.mark.linux_only
+def test_terminate_concurrently():
+    """Verify processes slow to exit are waited on together."""
+    script = (
+        "import signal, sys, time\n"
+        "signal.signal(signal.SIGTERM, lambda *_: (time.sleep(0.5), sys.exit()))\n"
+        "print(flush=True)\n"
+        "time.sleep(30)\n"
+    )
+    processes = []
+    for _ in range(4):
+        process = psutil.Popen([sys.executable, "-c", script], stdout=subprocess.PIPE)
+        process.stdout.readline()  # the handler is installed
+        process.stdout.close()
+        processes.append(process)
+
+    start = time.monotonic()
+    terminate(processes, timeout=5)
+    elapsed = time.monotonic() - start
+
+    assert not any(process.is_running() for process in processes)
+    assert elapsed < 1.5
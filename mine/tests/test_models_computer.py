@@ -1,6 +1,7 @@
 from unittest.mock import Mock, patch
 
 from mine.models import Computer, ProgramConfig
+from mine.models.computer import read_serial
 
 
 @patch("uuid.getnode", Mock(return_value=0))
@@ -56,3 +57,80 @@ class TestComputer:
         assert "00:00:00:00:00:00" == this.address
         assert "Sample.local" == this.hostname
         assert 1 == len(config.computers)
+
+
+@patch("uuid.getnode", Mock(return_value=0))
+@patch("socket.gethostname", Mock(return_value="Sample.local"))
+@patch("mine.models.computer.get_boot_id", Mock(return_value="boot1"))
+class TestIdentity:
+    """Unit tests for the cached computer identity."""
+
+    @patch("mine.models.computer.detect_serial", Mock(return_value="abc"))
+    def test_cached(self):
+        """Verify identifying information is only detected once."""
+        with patch("mine.models.computer.detect_address") as mock_address:
+            mock_address.return_value = "00:00:00:00:00:00"
+            assert "abc" == Computer("first").serial
+            assert "abc" == Computer("second").serial
+            assert 1 == mock_address.call_count
+
+    def test_loaded_once(self):
+        """Verify the cache is read once per computer."""
+        with patch("mine.cache.load", return_value={}) as mock_load:
+            with patch("mine.models.computer.detect_serial", Mock(return_value="")):
+                Computer("first")
+        assert 1 == mock_load.call_count
+
+    @patch("mine.models.computer.detect_serial", Mock(side_effect=["abc", "def"]))
+    def test_invalidated_by_hostname(self):
+        """Verify identifying information is detected when the hostname changes."""
+        assert "abc" == Computer("first").serial
+        with patch("socket.gethostname", Mock(return_value="Other.local")):
+            assert "def" == Computer("second").serial
+
+    @patch("mine.models.computer.detect_serial", Mock(side_effect=["abc", "def"]))
+    def test_invalidated_by_restart(self):
+        """Verify identifying information is detected after a restart."""
+        assert "abc" == Computer("first").serial
+        with patch("mine.models.computer.get_boot_id", Mock(return_value="boot2")):
+            assert "def" == Computer("second").serial
+
+
+class TestReadSerial:
+    """Unit tests for reading serial numbers without a subprocess."""
+
+    def test_disk_by_id(self, tmp_path):
+        """Verify the first disk's serial matches what udev reports."""
+        (tmp_path / "sda").touch()
+        (tmp_path / "by-id").mkdir()
+        (tmp_path / "by-id" / "ata-Disk_123").symlink_to(tmp_path / "sda")
+        (tmp_path / "by-id" / "wwn-0x5002").symlink_to(tmp_path / "sda")
+
+        with patch("mine.models.computer.DISK_BY_ID", str(tmp_path / "by-id")):
+            with patch("mine.models.computer.SYS_BLOCK", str(tmp_path)):
+                assert "Disk_123" == read_serial()
+
+    def test_sys_block(self, tmp_path):
+        """Verify the first disk's serial number can be read from sysfs."""
+        for name, serial in [("nvme0n1", "N123"), ("sda", "  S456\n")]:
+            (tmp_path / name / "device").mkdir(parents=True)
+            (tmp_path / name / "device" / "serial").write_text(serial)
+
+        with patch("mine.models.computer.DISK_BY_ID", str(tmp_path / "by-id")):
+            with patch("mine.models.computer.SYS_BLOCK", str(tmp_path)):
+                assert "S456" == read_serial()
+
+    def test_sys_block_other_disks(self, tmp_path):
+        """Verify serial numbers of disks other than the first are ignored."""
+        (tmp_path / "nvme0n1" / "device").mkdir(parents=True)
+        (tmp_path / "nvme0n1" / "device" / "serial").write_text("N123")
+
+        with patch("mine.models.computer.DISK_BY_ID", str(tmp_path / "by-id")):
+            with patch("mine.models.computer.SYS_BLOCK", str(tmp_path)):
+                assert None is read_serial()
+
+    def test_missing(self, tmp_path):
+        """Verify None is returned when no serial number is available."""
+        with patch("mine.models.computer.DISK_BY_ID", str(tmp_path / "by-id")):
+            with patch("mine.models.computer.SYS_BLOCK", str(tmp_path)):
+                assert None is read_serial()
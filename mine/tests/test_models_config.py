@@ -46,6 +46,53 @@ class TestProgramConfig:
         with pytest.raises(AssertionError):
             self.config.get_computer("fake")
 
+    def test_find_application_after_changes(self):
+        """Verify application lookups reflect changes to the list."""
+        config = ProgramConfig(applications=[Application("iTunes")])
+        assert None is config.find_application("slack")
+
+        config.applications.append(Application("Slack"))
+        assert "Slack" == config.find_application("slack").name
+
+        config.applications.pop(0)
+        assert None is config.find_application("itunes")
+
+        config.applications = [Application("iTunes")]
+        assert "iTunes" == config.find_application("ITUNES").name
+
+    def test_find_application_duplicates(self):
+        """Verify the first matching application is found."""
+        first = Application("Slack")
+        config = ProgramConfig(applications=[first, Application("slack")])
+        assert first is config.find_application("SLACK")
+
+    def test_find_application_after_replacement(self):
+        """Verify a replaced application can be found before its old name."""
+        config = ProgramConfig(applications=[Application("iTunes")])
+        assert "iTunes" == config.find_application("itunes").name
+
+        config.applications[0] = Application("Slack")
+        assert "Slack" == config.find_application("slack").name
+        assert None is config.find_application("itunes")
+
+    def test_find_application_after_rename(self):
+        """Verify a renamed application can be found by its new name."""
+        config = ProgramConfig(applications=[Application("iTunes")])
+        assert "iTunes" == config.find_application("itunes").name
+
+        config.applications[0].name = "Slack"
+        assert "Slack" == config.find_application("slack").name
+        assert None is config.find_application("itunes")
+
+    def test_find_computer_after_replacement(self):
+        """Verify computer lookups reflect items replaced in place."""
+        config = ProgramConfig(computers=[Computer("abc", "s1", "1:1", "abc.local")])
+        assert "abc" == config.find_computer("ABC").name
+
+        config.computers[0] = Computer("def", "s2", "2:2", "def.local")
+        assert None is config.find_computer("abc")
+        assert "def" == config.find_computer("def").name
+
     def test_match_computer(self):
         """Verify a similar computer can be found."""
         computer = self.config.match_computer("AB")
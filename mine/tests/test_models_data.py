@@ -1,9 +1,11 @@
 # pylint: disable=unused-variable
 
+import os
+
 import datafiles
 import pytest
 
-from mine.models import Data
+from mine.models import Application, Computer, Data
 
 
 def describe_data():
@@ -42,3 +44,206 @@ def describe_data():
             data.status.counter = 1
             data.prune_status(reset_counter=True)
             assert data.status.counter == 0
+
+    def describe_transaction():
+        @pytest.fixture
+        def saved(tmp_path):
+            data = Data(str(tmp_path / "mine.yml"))
+            data.save()
+            return data
+
+        def it_writes_changes_once(saved: Data, monkeypatch):
+            writes = []
+            monkeypatch.setattr(Data, "save", lambda self: writes.append(self))
+
+            with saved.transaction():
+                saved.status.counter += 1
+                saved.status.counter += 1
+
+            assert [saved] == writes
+
+        def it_persists_changes(saved: Data, tmp_path):
+            with saved.transaction():
+                saved.status.counter = 42
+
+            assert "counter: 42" in (tmp_path / "mine.yml").read_text()
+            assert ["mine.yml"] == [path.name for path in tmp_path.iterdir()]
+
+        def it_rebases_large_timestamps(saved: Data, tmp_path):
+            computer = Computer("laptop", "abc123", "AA:BB:CC:DD:EE:FF", "laptop")
+            with saved.transaction():
+                saved.status.counter = 10_000
+                saved.status.start(Application("Slack"), computer)
+                assert True is saved.modified
+
+            assert "started: 1\n" in (tmp_path / "mine.yml").read_text()
+            assert 1 == saved.status.counter
+            assert False is saved.modified
+
+        def it_skips_writing_unchanged_settings(saved: Data, tmp_path):
+            path = tmp_path / "mine.yml"
+            inode = path.stat().st_ino
+
+            with saved.transaction():
+                saved.status.counter = saved.status.counter
+
+            assert inode == path.stat().st_ino
+
+    def describe_models():
+        @pytest.fixture
+        def loaded(tmp_path):
+            data = Data(str(tmp_path / "mine.yml"))
+            computer = Computer("laptop", "abc123", "AA:BB:CC:DD:EE:FF", "laptop")
+            with data.transaction():
+                data.config.computers.append(computer)
+                for name in ["Slack", "Spotify"]:
+                    data.config.applications.append(Application(name))
+                    data.status.start(data.config.applications[-1], computer)
+            return Data(str(tmp_path / "mine.yml"))
+
+        def it_stores_nested_items_without_dictionaries(loaded: Data):
+            status = loaded.status.applications[0]
+            items = [
+                loaded.config.applications[0],
+                loaded.config.applications[0].versions,
+                loaded.config.computers[0],
+                status,
+                status.computers[0],
+                status.computers[0].timestamp,
+            ]
+
+            for item in items:
+                assert not hasattr(item, "__dict__")
+                assert item.datafile
+
+        def it_shares_converters_between_items(loaded: Data):
+            first, second = loaded.config.applications[:2]
+
+            assert first.datafile.attrs is second.datafile.attrs
+
+        def it_round_trips_settings(loaded: Data, tmp_path):
+            text = (tmp_path / "mine.yml").read_text()
+
+            assert text == loaded.datafile.text
+
+    def describe_shards():
+        @pytest.fixture
+        def computers():
+            return [
+                Computer("laptop", "abc123", "AA:BB:CC:DD:EE:FF", "laptop"),
+                Computer("desktop", "def456", "11:22:33:44:55:66", "desktop"),
+            ]
+
+        @pytest.fixture
+        def path(tmp_path, computers):
+            data = Data(str(tmp_path / "mine.yml"))
+            with data.transaction():
+                data.config.computers.extend(computers)
+                data.config.applications.append(Application("Slack"))
+                for computer in computers:
+                    data.status.start(data.config.applications[0], computer)
+            return tmp_path / "mine.yml"
+
+        def it_is_disabled_without_a_directory(path, computers):
+            data = Data(str(path))
+
+            assert False is data.use_shards(computers[0])
+            assert None is data.shards
+
+        def it_moves_the_status_into_a_file_per_computer(path, computers):
+            (path.parent / "status").mkdir()
+            data = Data(str(path))
+
+            assert True is data.use_shards(computers[0])
+
+            assert "status:" not in path.read_text()
+            assert ["desktop.yml", "laptop.yml"] == sorted(
+                p.name for p in (path.parent / "status").iterdir()
+            )
+            assert 2 == data.status.counter
+            assert 2 == len(data.status.applications[0].computers)
+
+        def it_merges_changes_from_other_computers(path, computers):
+            (path.parent / "status").mkdir()
+            laptop, desktop = computers
+            first = Data(str(path))
+            first.use_shards(laptop)
+            second = Data(str(path))
+            second.use_shards(desktop)
+            application = first.config.applications[0]
+            assert False is first.modified
+
+            with second.transaction():
+                second.status.stop(application, desktop)
+
+            assert True is first.modified
+            assert not first.status.is_running(application, desktop)
+            assert "desktop.yml" in os.listdir(path.parent / "status")
+
+        def it_orders_queued_launches_by_writer(path, computers):
+            (path.parent / "status").mkdir()
+            laptop, desktop = computers
+            first = Data(str(path))
+            first.use_shards(laptop)
+            second = Data(str(path))
+            second.use_shards(desktop)
+            application = first.config.applications[0]
+
+            with first.transaction():
+                first.status.queue(application, desktop)
+            second.reload()
+            assert "desktop" == second.status.find(application).next
+
+            with second.transaction():
+                second.status.find(application).next = None
+            first.reload()
+            assert None is first.status.find(application).next
+
+    def describe_reconcile():
+        @pytest.fixture
+        def computers():
+            return [
+                Computer("laptop", "abc123", "AA:BB:CC:DD:EE:FF", "laptop"),
+                Computer("desktop", "def456", "11:22:33:44:55:66", "desktop"),
+            ]
+
+        @pytest.fixture
+        def path(tmp_path, computers):
+            path = tmp_path / "mine.yml"
+            data = Data(str(path))
+            with data.transaction():
+                data.config.computers.extend(computers)
+                data.config.applications.append(Application("Slack"))
+                data.status.start(data.config.applications[0], computers[0])
+            return path
+
+        def it_merges_status_from_conflicted_copies(path, computers):
+            laptop, desktop = computers
+            conflict = path.with_name("mine (Jace's conflicted copy 2015-03-11).yml")
+            conflict.write_text(path.read_text())
+            copy = Data(str(conflict))
+            application = copy.config.applications[0]
+            with copy.transaction():
+                copy.status.stop(application, laptop)
+                copy.status.start(application, desktop)
+                copy.status.queue(application, laptop)
+            data = Data(str(path))
+
+            assert 1 == data.reconcile([str(conflict)])
+
+            data = Data(str(path))
+            assert 3 == data.status.counter
+            assert not data.status.is_running(application, laptop)
+            assert data.status.is_running(application, desktop)
+            assert "laptop" == data.status.find(application).next
+
+        def it_skips_unreadable_copies(path, computers):
+            conflict = path.with_name("mine (Jace's conflicted copy 2015-03-11).yml")
+            conflict.write_text("status: [")
+            data = Data(str(path))
+            text = path.read_text()
+
+            assert 0 == data.reconcile([str(conflict)])
+
+            assert text == path.read_text()
+            assert data.status.is_running(data.config.applications[0], computers[0])
@@ -0,0 +1,64 @@
+# pylint: disable=unused-variable
+
+import io
+
+from datafiles import formats
+
+from mine.models.formats import YAML
+
+TEXT = """
+config:
+  computers:
+    - name: macbook
+      address: AA:BB:CC:DD:EE:FF
+      serial: '123'
+  applications:
+    - name: yes
+      versions:
+        mac: iTunes.app
+        linux:
+status:
+  counter: 42
+  applications:
+    -
+""".lstrip()
+
+
+def describe_yaml():
+    def describe_deserialize():
+        def it_uses_yaml_1_2_scalars():
+            data = YAML.deserialize(io.StringIO(TEXT))
+
+            computer = data["config"]["computers"][0]
+            assert "AA:BB:CC:DD:EE:FF" == computer["address"]
+            assert "123" == computer["serial"]
+            assert "yes" == data["config"]["applications"][0]["name"]
+            assert None is data["config"]["applications"][0]["versions"]["linux"]
+            assert 42 == data["status"]["counter"]
+
+        def it_matches_the_default_formatter():
+            expected = formats.YAML.deserialize(io.StringIO(TEXT))
+
+            assert expected == YAML.deserialize(io.StringIO(TEXT))
+
+    def describe_serialize():
+        def it_matches_the_default_layout():
+            data = YAML.deserialize(io.StringIO(TEXT))
+
+            assert TEXT == YAML.serialize(data)
+
+        def it_indents_nested_sequences():
+            data = {"a": [["b", "c"], {"d": ["e"]}]}
+
+            text = YAML.serialize(data)
+
+            assert "a:\n  - - b\n    - c\n  - d:\n      - e\n" == text
+            assert data == YAML.deserialize(io.StringIO(text))
+
+        def it_quotes_ambiguous_strings():
+            data = {"a": ["123", "", "null", "1.5"]}
+
+            assert data == YAML.deserialize(io.StringIO(YAML.serialize(data)))
+
+        def it_handles_empty_data():
+            assert "" == YAML.serialize({})
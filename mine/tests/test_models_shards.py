@@ -0,0 +1,75 @@
+# pylint: disable=unused-variable,redefined-outer-name
+
+import pytest
+
+from mine.models import ProgramStatus, State, Status
+from mine.models.shards import Shards
+
+
+def create_status(counter: int, computer: str, next=None) -> ProgramStatus:
+    state = State(computer)
+    state.timestamp.started = counter
+    return ProgramStatus(counter, [Status("slack", [state], next)])
+
+
+def describe_shards():
+    @pytest.fixture
+    def shards(tmp_path):
+        return Shards(str(tmp_path), "laptop")
+
+    def describe_load():
+        def it_reads_each_computers_file(shards: Shards):
+            shards.save(create_status(3, "laptop"))
+            shards.save(create_status(7, "desktop"), "desktop")
+
+            loaded = shards.load()
+
+            assert ["desktop", "laptop"] == sorted(loaded)
+            assert 7 == loaded["desktop"].counter
+            assert 7 == shards.latest
+
+        def it_skips_invalid_files(shards: Shards, tmp_path):
+            (tmp_path / "desktop.yml").write_text("counter: [")
+
+            assert {} == shards.load()
+
+        def it_skips_temporary_files(shards: Shards, tmp_path):
+            (tmp_path / "~desktop.yml.123.tmp").write_text("counter: 1")
+
+            assert {} == shards.load()
+
+    def describe_changed():
+        def it_is_false_after_loading(shards: Shards):
+            shards.save(create_status(1, "desktop"), "desktop")
+            shards.load()
+
+            assert False is shards.changed()
+
+        def it_is_true_after_another_computer_writes(shards: Shards):
+            shards.load()
+            Shards(shards.directory, "desktop").save(create_status(1, "desktop"))
+
+            assert True is shards.changed()
+
+        def it_is_false_after_writing(shards: Shards):
+            shards.load()
+            shards.save(create_status(1, "laptop"))
+
+            assert False is shards.changed()
+
+    def describe_save():
+        def it_skips_changes_to_only_the_counter(shards: Shards):
+            status = create_status(1, "laptop")
+            assert True is shards.save(status)
+
+            status.counter += 1
+            assert False is shards.differs(status)
+            assert False is shards.save(status)
+
+        def it_writes_other_changes(shards: Shards):
+            status = create_status(1, "laptop")
+            shards.save(status)
+
+            status.applications[0].next = "desktop"
+            assert True is shards.differs(status)
+            assert True is shards.save(status)
@@ -1,5 +1,6 @@
 # pylint: disable=attribute-defined-outside-init
 
+import random
 from unittest.mock import Mock
 
 import pytest
@@ -131,3 +132,232 @@ class TestProgramStatus:
         assert not self.status.is_running(self.application, self.computer)
         assert not self.status.is_running(self.application, self.computer2)
         assert 3 == self.status.counter
+
+    def test_find_after_changes(self):
+        """Verify application lookups reflect changes to the list."""
+        status = self.status.find(self.application)
+        assert status is self.status.find(self.application)
+
+        self.status.applications.remove(status)
+        assert status is not self.status.find(self.application)
+        assert 1 == len(self.status.applications)
+
+    def test_find_after_rename(self):
+        """Verify a renamed status is found instead of being duplicated."""
+        status = self.status.find(self.application)
+        self.status.find(Application("other"))
+
+        status.application = "renamed"
+        assert status is self.status.find(Application("renamed"))
+        assert 2 == len(self.status.applications)
+
+    def test_compact(self):
+        """Verify old inactive states are removed without changing decisions."""
+        other = Application("other")
+        self.status.start(self.application, self.computer)
+        self.status.stop(self.application, self.computer2)
+        self.status.start(other, self.computer2)
+        self.status.stop(other, self.computer2)
+        self.status.start(self.application, self.computer3)
+        self.status.counter += 1
+
+        assert 2 == self.status.compact(age=1)
+
+        assert 1 == len(self.status.applications)
+        assert ["local", "remote2"] == [
+            state.computer for state in self.status.applications[0].computers
+        ]
+        assert "remote2" == self.status.get_latest(self.application)
+        assert not self.status.is_running(other, self.computer2)
+
+    def test_compact_keeps_recent_changes(self):
+        """Verify states changed within the age are kept."""
+        self.status.stop(self.application, self.computer)
+        self.status.start(self.application, self.computer2)
+
+        assert 0 == self.status.compact(age=1)
+        assert 2 == len(self.status.applications[0].computers)
+
+    def test_compact_keeps_queued_applications(self):
+        """Verify an application queued for launch is kept without any states."""
+        self.status.stop(self.application, self.computer)
+        self.status.queue(self.application, self.computer2)
+        self.status.counter += 10
+
+        assert 1 == self.status.compact(age=1)
+        assert "remote" == self.status.find(self.application).next
+
+    def test_compact_forgets_idle_computers(self):
+        """Verify every state of a long-idle computer is removed."""
+        self.status.start(self.application, self.computer)
+        self.status.start(self.application, self.computer2)
+        self.status.counter += 10
+        self.status.stop(Application("other"), self.computer2)
+
+        assert 1 == self.status.compact(window=5)
+        assert "remote" == self.status.get_latest(self.application)
+        assert not self.status.is_running(self.application, self.computer)
+
+    def test_rebase(self):
+        """Verify timestamps are shifted down so the oldest becomes one."""
+        self.status.counter = 5000
+        self.status.start(self.application, self.computer)
+        self.status.stop(self.application, self.computer2)
+
+        assert 5000 == self.status.rebase()
+
+        states = self.status.applications[0].computers
+        assert (1, 0) == (states[0].timestamp.started, states[0].timestamp.stopped)
+        assert (0, 2) == (states[1].timestamp.started, states[1].timestamp.stopped)
+        assert 2 == self.status.counter
+
+    def test_rebase_below_threshold(self):
+        """Verify small offsets are left alone to avoid rewriting every state."""
+        self.status.counter = 10
+        self.status.start(self.application, self.computer)
+
+        assert 0 == self.status.rebase()
+        assert 11 == self.status.counter
+
+    @pytest.mark.parametrize("seed", range(20))
+    def test_rebase_preserves_decisions(self, seed):
+        """Verify activity and ordering are unchanged by rebasing."""
+        generator = random.Random(seed)
+        applications = [Application(f"app{index}") for index in range(4)]
+        computers = [self.computer, self.computer2, self.computer3]
+        self.status.counter = generator.randrange(10_000)
+        for _ in range(50):
+            action = generator.choice([self.status.start, self.status.stop])
+            action(generator.choice(applications), generator.choice(computers))
+
+        def decisions():
+            return [
+                (
+                    self.status.get_latest(application),
+                    [self.status.is_running(application, c) for c in computers],
+                    sorted(
+                        range(len(computers)),
+                        key=lambda i, a=application: self._latest(a, computers[i]),
+                    ),
+                )
+                for application in applications
+            ]
+
+        expected = decisions()
+        self.status.rebase(threshold=0)
+
+        assert expected == decisions()
+        timestamps = [
+            t
+            for status in self.status.applications
+            for state in status.computers
+            for t in (state.timestamp.started, state.timestamp.stopped)
+        ]
+        assert 1 == min(t for t in timestamps if t)
+        assert self.status.counter == max(timestamps)
+
+    def _latest(self, application, computer):
+        for state in self.status.find(application).computers:
+            if state.computer == computer.name:
+                return state.timestamp.latest
+        return 0
+
+    def test_extract(self):
+        """Verify one computer's states and every queued launch are extracted."""
+        other = Application("other")
+        self.status.start(self.application, self.computer)
+        self.status.start(self.application, self.computer2)
+        self.status.start(other, self.computer2)
+        self.status.queue(other, self.computer)
+
+        shard = self.status.extract("local")
+
+        assert 3 == shard.counter
+        assert ["my-application", "other"] == [
+            s.application for s in shard.applications
+        ]
+        assert ["local"] == [s.computer for s in shard.applications[0].computers]
+        assert [] == shard.applications[1].computers
+        assert "local" == shard.applications[1].next
+
+    def test_merge(self):
+        """Verify each computer's states come from its own status."""
+        self.status.start(self.application, self.computer)
+        self.status.start(self.application, self.computer2)
+        local = self.status.extract("local")
+        remote = ProgramStatus()
+        remote.counter = 9
+        remote.stop(self.application, self.computer2)
+        remote.start(self.application, self.computer)  # ignored, not its own
+
+        self.status.merge({"local": local, "remote": remote})
+
+        assert 11 == self.status.counter
+        assert self.status.is_running(self.application, self.computer)
+        assert not self.status.is_running(self.application, self.computer2)
+        assert "local" == self.status.get_latest(self.application)
+
+    def test_merge_queued_from_latest(self):
+        """Verify queued launches come from the most recently written status."""
+        self.status.queue(self.application, self.computer2)
+        first = self.status.extract("local")
+        first.counter = 1
+        second = ProgramStatus(2, [Status("other", next="local")])
+
+        self.status.merge({"local": first, "remote": second})
+
+        assert None is self.status.find(self.application).next
+        assert "local" == self.status.find(Application("other")).next
+
+    def test_reconcile(self):
+        """Verify conflicting copies keep the latest change to each state."""
+        self.status.start(self.application, self.computer)
+        copy = ProgramStatus(1, [Status(self.application.name, [State("local")])])
+        copy.applications[0].computers[0].timestamp.started = 1
+        copy.stop(self.application, self.computer)
+        copy.start(self.application, self.computer2)
+        self.status.start(self.application, self.computer3)
+
+        merged = self.status.reconcile(copy)
+
+        assert 3 == merged.counter
+        assert not merged.is_running(self.application, self.computer)
+        assert merged.is_running(self.application, self.computer2)
+        assert merged.is_running(self.application, self.computer3)
+        assert ["local", "remote", "remote2"] == [
+            state.computer for state in merged.applications[0].computers
+        ]
+        timestamp = merged.applications[0].computers[0].timestamp
+        assert (1, 2) == (timestamp.started, timestamp.stopped)
+
+    def test_reconcile_queued_from_latest(self):
+        """Verify queued launches come from the copy with the highest counter."""
+        self.status.counter = 5
+        self.status.queue(Application("other"), self.computer)
+        self.status.find(self.application)
+        copy = ProgramStatus(3)
+        copy.queue(self.application, self.computer2)
+        newer = ProgramStatus(7)
+        newer.queue(Application("third"), self.computer3)
+
+        merged = self.status.reconcile(copy)
+
+        assert None is merged.find(self.application).next
+        assert "local" == merged.find(Application("other")).next
+
+        merged = self.status.reconcile(copy, newer)
+
+        assert None is merged.find(Application("other")).next
+        assert "remote2" == merged.find(Application("third")).next
+
+    def test_reconcile_leaves_copies_unchanged(self):
+        """Verify a new status is created from the copies."""
+        self.status.start(self.application, self.computer)
+        copy = ProgramStatus()
+        copy.start(self.application, self.computer)
+
+        merged = self.status.reconcile(copy)
+        merged.stop(self.application, self.computer)
+
+        assert self.status.is_running(self.application, self.computer)
+        assert copy.is_running(self.application, self.computer)
@@ -0,0 +1,83 @@
+# pylint: disable=no-value-for-parameter
+
+import pytest
+
+from mine.models import ProgramStatus, State, Status
+
+hypothesis = pytest.importorskip("hypothesis")
+st = pytest.importorskip("hypothesis.strategies")
+
+COMPUTERS = ["laptop", "desktop", "work"]
+APPLICATIONS = ["slack", "spotify", "iTunes"]
+
+
+@st.composite
+def statuses(draw) -> ProgramStatus:
+    timestamps = st.integers(min_value=0, max_value=50)
+    counter = draw(st.integers(min_value=0, max_value=60))
+    status = ProgramStatus(counter)
+    for name in draw(st.lists(st.sampled_from(APPLICATIONS), unique=True)):
+        states = []
+        for computer in draw(st.lists(st.sampled_from(COMPUTERS), unique=True)):
+            state = State(computer)
+            state.timestamp.started = draw(timestamps)
+            state.timestamp.stopped = draw(timestamps)
+            states.append(state)
+        queued = draw(st.none() | st.sampled_from(COMPUTERS))
+        status.applications.append(Status(name, states, queued))
+    return status
+
+
+def canonical(status: ProgramStatus):
+    return status.counter, [
+        (
+            s.application,
+            s.next,
+            [
+                (c.computer, c.timestamp.started, c.timestamp.stopped)
+                for c in s.computers
+            ],
+        )
+        for s in status.applications
+    ]
+
+
+@hypothesis.given(statuses(), statuses())
+def test_reconcile_is_commutative(first, second):
+    assert canonical(first.reconcile(second)) == canonical(second.reconcile(first))
+
+
+@hypothesis.given(statuses(), statuses(), statuses())
+def test_reconcile_is_associative(first, second, third):
+    left = first.reconcile(second).reconcile(third)
+    right = first.reconcile(second.reconcile(third))
+    assert canonical(left) == canonical(right)
+
+
+@hypothesis.given(statuses())
+def test_reconcile_is_idempotent(status):
+    merged = status.reconcile()
+    assert canonical(merged) == canonical(status.reconcile(status))
+    assert canonical(merged) == canonical(merged.reconcile())
+
+
+@hypothesis.given(statuses(), statuses())
+def test_reconcile_absorbs_merged_copies(first, second):
+    merged = first.reconcile(second)
+    assert canonical(merged) == canonical(merged.reconcile(second))
+
+
+@hypothesis.given(statuses(), statuses())
+def test_reconcile_keeps_every_change(first, second):
+    merged = first.reconcile(second)
+
+    assert merged.counter == max(first.counter, second.counter)
+    applications = {status.application: status for status in merged.applications}
+    for copy in (first, second):
+        for status in copy.applications:
+            computers = applications[status.application].computers
+            states = {state.computer: state for state in computers}
+            for state in status.computers:
+                timestamp = states[state.computer].timestamp
+                assert timestamp.started >= state.timestamp.started
+                assert timestamp.stopped >= state.timestamp.stopped
@@ -0,0 +1,65 @@
+# pylint: disable=unused-variable,redefined-outer-name
+
+import json
+import threading
+
+import pytest
+
+from mine import profiler
+
+
+def describe_phase():
+    @pytest.fixture
+    def path(tmp_path):
+        return tmp_path / "mine.profile.jsonl"
+
+    def it_records_nothing_by_default(path, monkeypatch):
+        monkeypatch.delenv(profiler.ENVIRONMENT_VARIABLE, raising=False)
+        with profiler.phase("load"):
+            pass
+        profiler.flush(str(path))
+        assert not path.exists()
+
+    def it_records_json_lines_when_enabled(path, monkeypatch):
+        monkeypatch.setenv(profiler.ENVIRONMENT_VARIABLE, "1")
+        with profiler.phase("update"):
+            with profiler.phase("processes"):
+                pass
+        profiler.flush(str(path))
+
+        records = [json.loads(line) for line in path.read_text().splitlines()]
+        assert records == [
+            {**records[0], "phase": "processes", "parent": "update"},
+            {**records[1], "phase": "update", "parent": None},
+        ]
+        assert records[1]["wall"] >= records[0]["wall"] >= 0
+        assert records[1]["cpu"] >= 0
+
+    def it_tracks_nesting_in_each_thread(path, monkeypatch):
+        monkeypatch.setenv(profiler.ENVIRONMENT_VARIABLE, "1")
+
+        def sweep():
+            with profiler.phase("conflicts"):
+                pass
+
+        with profiler.phase("update"):
+            thread = threading.Thread(target=sweep)
+            thread.start()
+            thread.join()
+        profiler.flush(str(path))
+
+        records = [json.loads(line) for line in path.read_text().splitlines()]
+        parents = {record["phase"]: record["parent"] for record in records}
+        assert {"conflicts": None, "update": None} == parents
+
+    def it_numbers_each_cycle(path, monkeypatch):
+        monkeypatch.setenv(profiler.ENVIRONMENT_VARIABLE, "1")
+        with profiler.phase("save"):
+            pass
+        profiler.flush(str(path))
+        with profiler.phase("save"):
+            pass
+        profiler.flush(str(path))
+
+        first, second = [json.loads(line) for line in path.read_text().splitlines()]
+        assert second["cycle"] == first["cycle"] + 1
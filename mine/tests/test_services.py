@@ -1,6 +1,8 @@
 # pylint: disable=redefined-outer-name
 
 import os
+import threading
+import time
 from unittest.mock import Mock, patch
 
 import pytest
@@ -65,6 +67,26 @@ class TestFindConfigPath:
         with pytest.raises(OSError):
             services.find_config_path(tmp_dir)
 
+    def test_find_cached(self, tmp_dir):
+        """Verify a found settings file is remembered."""
+        touch("Dropbox", "a", services.CONFIG)
+        path = services.find_config_path(tmp_dir)
+
+        with patch("os.walk") as mock_walk:
+            assert path == services.find_config_path(tmp_dir)
+            assert 0 == mock_walk.call_count
+
+    def test_find_cached_missing(self, tmp_dir):
+        """Verify a settings file is found again when it moves."""
+        touch("Dropbox", "a", services.CONFIG)
+        path = services.find_config_path(tmp_dir)
+        os.remove(path)
+        touch("Dropbox", "b", services.CONFIG)
+
+        path = services.find_config_path(tmp_dir)
+
+        assert os.path.join(tmp_dir, "Dropbox", "b", services.CONFIG) == path
+
     def test_find_no_share(self):
         """Verify an error occurs when no service directory is found."""
         with pytest.raises(EnvironmentError):
@@ -72,6 +94,13 @@ class TestFindConfigPath:
                 services.find_config_path(FILES)
 
 
+def age(*paths, seconds=60):
+    """Make directories look like they were last modified a while ago."""
+    mtime = time.time() - seconds
+    for path in paths:
+        os.utime(path, (mtime, mtime))
+
+
 @patch("os.remove")
 class TestDeleteConflicts:
     @staticmethod
@@ -112,3 +141,155 @@ class TestDeleteConflicts:
 
         assert count == 2
         assert 2 == mock_remove.call_count
+
+    def test_config_only_is_limited_to_the_settings_directory(
+        self, mock_remove, tmpdir
+    ):
+        root = str(tmpdir)
+        touch(root, "settings", services.CONFIG)
+        touch(root, "settings", "mine (Jace's conflicted copy 2015-03-11).yml")
+        touch(root, "other", "mine (Jace's conflicted copy 2015-03-11).yml")
+
+        path = os.path.join(root, "settings", services.CONFIG)
+        count = services.delete_conflicts(root, config_only=True, force=True, path=path)
+
+        assert count == 1
+        mock_remove.assert_called_once_with(
+            os.path.join(
+                root, "settings", "mine (Jace's conflicted copy 2015-03-11).yml"
+            )
+        )
+
+    def test_unchanged_directories_are_not_rescanned(self, _, tmpdir):
+        root = self._create_conflicts(tmpdir)
+        touch(root, "a", "b", "c.txt")
+        age(root, os.path.join(root, "a"), os.path.join(root, "a", "b"))
+
+        with patch("os.scandir", wraps=os.scandir) as mock_scandir:
+            services.delete_conflicts(root)
+            assert 3 == mock_scandir.call_count
+            services.delete_conflicts(root)
+            assert 3 == mock_scandir.call_count
+
+    def test_recently_changed_directories_are_rescanned(self, _, tmpdir):
+        root = self._create_conflicts(tmpdir, count=0)
+        assert 0 == services.delete_conflicts(root, force=True)
+        mtime = os.stat(root).st_mtime_ns
+
+        self._create_conflicts(root, count=1)
+        os.utime(root, ns=(mtime, mtime))
+
+        assert 1 == services.delete_conflicts(root, force=True)
+
+    def test_config_only_with_relative_path(self, _, tmp_dir):
+        touch(tmp_dir, services.CONFIG)
+        touch(tmp_dir, "mine (Jace's conflicted copy 2015-03-11).yml")
+
+        count = services.delete_conflicts(
+            tmp_dir, config_only=True, force=True, path=services.CONFIG
+        )
+
+        assert count == 1
+
+    def test_changed_directories_are_rescanned(self, _, tmpdir):
+        root = self._create_conflicts(tmpdir, count=0)
+        touch(root, "a", "b", "c.txt")
+        assert 0 == services.delete_conflicts(root, force=True)
+
+        self._create_conflicts(os.path.join(root, "a", "b"), count=1)
+
+        assert 1 == services.delete_conflicts(root, force=True)
+
+
+@patch.object(services, "SETTLE_INTERVAL", 0.02)
+class TestSettle:
+    @staticmethod
+    def _later(seconds, function, *args):
+        timer = threading.Timer(seconds, function, args)
+        timer.start()
+        return timer
+
+    def test_quiet_files_settle_after_the_window(self, tmp_dir):
+        touch(tmp_dir, services.CONFIG)
+        start = time.monotonic()
+
+        assert services.settle(services.CONFIG, quiet=0.1, timeout=5)
+
+        assert 0.1 <= time.monotonic() - start < 1
+
+    def test_changes_restart_the_window(self, tmp_dir):
+        touch(tmp_dir, services.CONFIG)
+        start = time.monotonic()
+
+        def append():
+            with open(services.CONFIG, "a", encoding="utf-8") as file:
+                file.write("x")
+
+        timers = [self._later(delay, append) for delay in (0.1, 0.2)]
+        assert services.settle(services.CONFIG, quiet=0.15, timeout=5)
+
+        assert time.monotonic() - start >= 0.35
+        for timer in timers:
+            timer.join()
+
+    def test_temporary_files_must_be_gone(self, tmp_dir):
+        touch(tmp_dir, services.CONFIG)
+        touch(tmp_dir, "~mine.yml.123.tmp")
+        start = time.monotonic()
+
+        timer = self._later(0.2, os.remove, "~mine.yml.123.tmp")
+        assert services.settle(services.CONFIG, quiet=0.05, timeout=5)
+
+        assert time.monotonic() - start >= 0.25
+        timer.join()
+
+    def test_conflicts_wait_until_the_timeout(self, tmp_dir):
+        touch(tmp_dir, services.CONFIG)
+        touch(tmp_dir, "mine (Jace's conflicted copy 2015-03-11).yml")
+
+        assert not services.settle(services.CONFIG, quiet=0.05, timeout=0.2)
+
+    def test_missing_files_wait_until_the_timeout(self, tmp_dir):
+        assert not services.settle(services.CONFIG, quiet=0.05, timeout=0.2)
+
+    def test_files_in_directories_must_be_quiet(self, tmp_dir):
+        touch(tmp_dir, services.CONFIG)
+        touch(tmp_dir, "status", "other.yml")
+        start = time.monotonic()
+
+        def append():
+            with open(os.path.join("status", "other.yml"), "a", encoding="utf-8") as f:
+                f.write("x")
+
+        timer = self._later(0.1, append)
+        assert services.settle(services.CONFIG, ["status"], quiet=0.15, timeout=5)
+
+        assert time.monotonic() - start >= 0.25
+        timer.join()
+
+
+class TestMergeConflicts:
+    def test_merge_and_delete(self, tmp_dir):
+        touch(tmp_dir, services.CONFIG)
+        conflicts = [
+            os.path.join(tmp_dir, f"mine (Jace's conflicted copy 2015-03-{day}).yml")
+            for day in (11, 12)
+        ]
+        for conflict in conflicts:
+            touch(conflict)
+        touch(tmp_dir, "other (Jace's conflicted copy 2015-03-11).yml")
+        data = Mock(path=services.CONFIG)
+
+        assert 2 == services.merge_conflicts(data)
+
+        assert sorted(conflicts) == sorted(data.reconcile.call_args.args[0])
+        assert not any(os.path.exists(conflict) for conflict in conflicts)
+        assert os.path.exists("other (Jace's conflicted copy 2015-03-11).yml")
+
+    def test_nothing_to_merge(self, tmp_dir):
+        touch(tmp_dir, services.CONFIG)
+        data = Mock(path=services.CONFIG)
+
+        assert 0 == services.merge_conflicts(data)
+
+        data.reconcile.assert_not_called()
@@ -0,0 +1,105 @@
+# pylint: disable=unused-variable,redefined-outer-name
+
+import threading
+import time
+
+import pytest
+
+from mine.watcher import Watcher
+
+
+def modify_later(path, delay=0.1):
+    def modify():
+        time.sleep(delay)
+        path.write_text("changed")
+
+    thread = threading.Thread(target=modify)
+    thread.start()
+    return thread
+
+
+def describe_watcher():
+    @pytest.fixture
+    def path(tmp_path):
+        path = tmp_path / "mine.yml"
+        path.write_text("original")
+        return path
+
+    def describe_polling():
+        @pytest.fixture
+        def watcher(path, monkeypatch):
+            monkeypatch.setattr(Watcher, "_add_watch", staticmethod(lambda _: None))
+            with Watcher(str(path), interval=0.05) as watcher:
+                yield watcher
+
+        def it_uses_polling(watcher):
+            assert watcher.polling
+
+        def it_times_out_without_changes(watcher):
+            assert False is watcher.wait(0.2)
+
+        def it_detects_changes(watcher, path):
+            thread = modify_later(path)
+            assert True is watcher.wait(5)
+            thread.join()
+
+        def it_ignores_drained_changes(watcher, path):
+            path.write_text("saved")
+            watcher.drain()
+            assert False is watcher.wait(0.2)
+
+    @pytest.mark.linux_only
+    def describe_inotify():
+        @pytest.fixture
+        def watcher(path):
+            with Watcher(str(path)) as watcher:
+                yield watcher
+
+        def it_uses_inotify(watcher):
+            assert not watcher.polling
+
+        def it_times_out_without_changes(watcher):
+            assert False is watcher.wait(0.2)
+
+        def it_detects_changes(watcher, path):
+            thread = modify_later(path)
+            start = time.monotonic()
+            assert True is watcher.wait(5)
+            assert time.monotonic() - start < 1
+            thread.join()
+
+        def it_ignores_other_files(watcher, path):
+            (path.parent / "other.txt").write_text("changed")
+            assert False is watcher.wait(0.2)
+
+        def it_ignores_drained_changes(watcher, path):
+            path.write_text("saved")
+            watcher.drain()
+            assert False is watcher.wait(0.2)
+
+    def describe_directories():
+        @pytest.fixture
+        def directory(tmp_path):
+            directory = tmp_path / "status"
+            directory.mkdir()
+            return directory
+
+        def it_detects_changes_when_polling(path, directory, monkeypatch):
+            monkeypatch.setattr(Watcher, "_add_watch", staticmethod(lambda _: None))
+            with Watcher(str(path), 0.05, [str(directory)]) as watcher:
+                thread = modify_later(directory / "laptop.yml")
+                assert True is watcher.wait(5)
+                thread.join()
+
+        @pytest.mark.linux_only
+        def it_detects_changes_with_inotify(path, directory):
+            with Watcher(str(path), directories=[str(directory)]) as watcher:
+                thread = modify_later(directory / "laptop.yml")
+                assert True is watcher.wait(5)
+                thread.join()
+
+        @pytest.mark.linux_only
+        def it_ignores_temporary_files(path, directory):
+            with Watcher(str(path), directories=[str(directory)]) as watcher:
+                (directory / "~laptop.yml.123.tmp").write_text("partial")
+                assert False is watcher.wait(0.2)
@@ -0,0 +1,192 @@
+"""Utilities to wait for changes to the settings file."""
+
+import ctypes
+import ctypes.util
+import functools
+import os
+import select
+import struct
+import sys
+import time
+from collections.abc import Sequence
+from contextlib import suppress
+
+import log
+
+POLL_INTERVAL = 5  # seconds between checks when inotify is unavailable
+
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+EVENT = struct.Struct("iIII")
+MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+
+@functools.cache
+def load_libc():
+    """Load the C library to call inotify functions."""
+    return ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+
+
+class Watcher:
+    """Wait for changes to a file using inotify with a polling fallback."""
+
+    def __init__(
+        self, path: str, interval: float = POLL_INTERVAL, directories: Sequence = ()
+    ):
+        """Watch a file for changes.
+
+        :param path: file to watch
+        :param interval: seconds between checks when polling
+        :param directories: also report changes to any file in these
+
+        """
+        self.path = os.path.abspath(path)
+        self.interval = interval
+        self.directories = [os.path.abspath(d) for d in directories]
+        self._fd: int | None = None
+        self._watches: set[int] = set()
+        self._stat = self._get_stat()
+        if sys.platform.startswith("linux"):
+            self._fd = self._add_watch(os.path.dirname(self.path))
+            for directory in self.directories:
+                self._add_directory(directory)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    @property
+    def polling(self) -> bool:
+        """Determine if changes are detected by polling the file."""
+        return self._fd is None
+
+    def fileno(self) -> int:
+        """Get the inotify descriptor that becomes readable on changes."""
+        assert self._fd is not None
+        return self._fd
+
+    def check(self) -> bool:
+        """Determine if the file changed since the last check without blocking."""
+        if self._fd is None:
+            return self._changed()
+        return self._read_events()
+
+    def close(self):
+        """Stop watching the file for changes."""
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def drain(self):
+        """Discard changes seen so far, such as the program's own writes."""
+        if self._fd is not None:
+            with suppress(BlockingIOError):
+                while os.read(self._fd, 64 * 1024):
+                    pass
+        self._stat = self._get_stat()
+
+    def wait(self, timeout: float, readers: Sequence = ()) -> bool:
+        """Block until the file changes, a reader is ready, or the timeout expires."""
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+
+            if self._fd is None:
+                if readers:
+                    ready, _, _ = select.select(
+                        readers, [], [], min(self.interval, remaining)
+                    )
+                else:
+                    time.sleep(min(self.interval, remaining))
+                    ready = []
+                if ready or self._changed():
+                    return True
+            else:
+                ready, _, _ = select.select([self._fd, *readers], [], [], remaining)
+                if any(reader in ready for reader in readers):
+                    return True
+                if ready and self._read_events():
+                    return True
+
+    def _get_stat(self):
+        stats = []
+        for path in [self.path, *self.directories]:
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                stats.append(None)
+            else:
+                stats.append((stat.st_ino, stat.st_size, stat.st_mtime_ns))
+        return tuple(stats)
+
+    def _changed(self) -> bool:
+        stat = self._get_stat()
+        if stat == self._stat:
+            return False
+        self._stat = stat
+        return True
+
+    @staticmethod
+    def _add_watch(dirname: str) -> int | None:
+        try:
+            libc = load_libc()
+            fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+            if fd < 0:
+                raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+            if libc.inotify_add_watch(fd, os.fsencode(dirname), MASK) < 0:
+                os.close(fd)
+                raise OSError(ctypes.get_errno(), "inotify_add_watch failed")
+        except (AttributeError, OSError) as e:
+            log.debug("Polling for changes, inotify is unavailable: %s", e)
+            return None
+
+        log.debug("Watching for changes with inotify: %s", dirname)
+        return fd
+
+    def _add_directory(self, dirname: str):
+        if self._fd is None:
+            return
+        watch = load_libc().inotify_add_watch(self._fd, os.fsencode(dirname), MASK)
+        if watch < 0:
+            error = ctypes.get_errno()
+            log.warning("Unable to watch %s: %s", dirname, os.strerror(error))
+            return
+        log.debug("Watching for changes with inotify: %s", dirname)
+        self._watches.add(watch)
+
+    def _read_events(self) -> bool:
+        assert self._fd is not None
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return False
+
+        filename = os.fsencode(os.path.basename(self.path))
+        changed = False
+        offset = 0
+        while offset < len(data):
+            watch, mask, _, length = EVENT.unpack_from(data, offset)
+            offset += EVENT.size
+            name = data[offset : offset + length].rstrip(b"\0")
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                changed = True
+            elif watch in self._watches:
+                # Sync services write to temporary files named like '~*.tmp'
+                changed = changed or bool(name and not name.startswith(b"~"))
+            elif name == filename:
+                changed = True
+
+        if changed:
+            self._stat = self._get_stat()
+        return changed
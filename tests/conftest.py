@@ -3,6 +3,8 @@
 import os
 
 from mine.tests.conftest import (  # pylint: disable=unused-import
+    cache_directory,
+    control_socket,
     pytest_configure,
     pytest_runtest_setup,
 )
@@ -0,0 +1,77 @@
+"""Integration tests for the benchmark harness."""
+
+import json
+
+import pytest
+
+from benchmarks import __main__ as benchmarks
+from benchmarks import cycle, memory, processes, serialization, stop
+
+
+def test_cycle():
+    """Verify every phase of the daemon cycle is timed."""
+    results = list(cycle.run(sizes=[(3, 2)], processes=10, files=20))
+
+    names = [result["name"] for result in results]
+    assert "load" in names
+    assert "save" in names
+    assert "update_status" in names
+    assert "launch_queued_applications" in names
+    assert "prune_status" in names
+    assert "delete_conflicts_cold" in names
+    assert "delete_conflicts_warm" in names
+    for result in results:
+        assert result["best"] <= result["mean"]
+
+
+def test_memory():
+    """Verify the memory used by loaded settings is measured."""
+    results = list(memory.run(sizes=[(3, 2)]))
+
+    assert ["load"] == [result["name"] for result in results]
+    assert 6 == results[0]["rows"]
+    assert results[0]["bytes_per_row"] > 0
+
+
+@pytest.mark.linux_only
+def test_processes():
+    """Verify process scans are timed against a synthetic '/proc'."""
+    results = list(processes.run(sizes=[5]))
+
+    names = [result["name"] for result in results]
+    assert ["scan_without_oneshot", "scan_uncached", "scan_cached"] == names
+    assert results[2]["opens"] < results[1]["opens"]
+
+
+def test_serialization():
+    """Verify each YAML formatter is timed."""
+    results = list(serialization.run(sizes=[(3, 2)]))
+
+    names = {result["name"] for result in results}
+    assert {"parse_ruamel", "parse_libyaml"} < names
+    assert {"serialize_ruamel", "serialize_libyaml"} < names
+
+
+def test_stop():
+    """Verify every process of an app is stopped from a single scan."""
+    results = list(stop.run(sizes=[(3, 4)], processes=10))
+
+    names = [result["name"] for result in results]
+    assert ["stop_per_instance", "stop_tree"] == names
+    assert 7 == results[0]["scans"]
+    assert 9 == results[0]["remaining"]
+    assert 1 == results[1]["scans"]
+    assert 0 == results[1]["remaining"]
+
+
+def test_output(tmp_path, monkeypatch):
+    """Verify results are written as JSON lines."""
+    monkeypatch.setattr(cycle, "SIZES", [(3, 2)])
+    monkeypatch.setattr(cycle, "FILES", 20)
+    path = tmp_path / "results.jsonl"
+
+    benchmarks.main(["cycle", "--output", str(path)])
+
+    for line in path.read_text().splitlines():
+        result = json.loads(line)
+        assert "cycle" == result["suite"]